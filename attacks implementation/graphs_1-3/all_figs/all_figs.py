@@ -22,11 +22,18 @@ KEY INSIGHT: When varying any parameter, f_T stays constant at 0.01 for both
 G calculation and normalization. This keeps RIA and MGA constant when varying r.
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import LogLocator, NullFormatter, ScalarFormatter
 import matplotlib
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))  # repo root, for the ldp package
+from ldp.gains import normalized_gain
+from ldp.protocols import compute_gains_kRR  # Table 1
+
 # Use a clean style matching the original
 plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.size'] = 10
@@ -41,31 +48,11 @@ DEFAULT_FT = 0.01
 DEFAULT_EPSILON = 1
 DEFAULT_D = 1024  # From Section 5.1: Zipf dataset has 1,024 items by default
 
-def compute_gains_kRR(beta, r, f_T, epsilon, d):
-    """
-    Compute overall gains for the three attacks on kRR.
-    
-    From Table 1:
-    - RPA: β(r/d - f_T)
-    - RIA: β(1 - f_T)
-    - MGA: β(1 - f_T) + β(d-r)/(e^ε - 1)
-    """
-    e_eps = np.exp(epsilon)
-    
-    G_RPA = beta * (r / d - f_T)
-    G_RIA = beta * (1 - f_T)
-    G_MGA = beta * (1 - f_T) + beta * (d - r) / (e_eps - 1)
-    
-    return G_RPA, G_RIA, G_MGA
-
 def compute_normalized_gains(G_RPA, G_RIA, G_MGA, f_T):
     """
     Normalized overall gain = (G + f_T) / f_T
     """
-    norm_RPA = (G_RPA + f_T) / f_T
-    norm_RIA = (G_RIA + f_T) / f_T
-    norm_MGA = (G_MGA + f_T) / f_T
-    return norm_RPA, norm_RIA, norm_MGA
+    return tuple(normalized_gain(G, f_T) for G in (G_RPA, G_RIA, G_MGA))
 
 # Parameter ranges based on Figure 1
 beta_range = np.logspace(-3, -1, 20)  # 10^-3 to 10^-1
@@ -300,6 +287,9 @@ print("Figure saved!")
 import numpy as np
 import matplotlib.pyplot as plt
 
+from ldp.gains import normalized_gain
+from ldp.protocols import PROTOCOLS
+
 # New color scheme - different from original paper
 color_RPA = '#9467bd'  # Purple
 color_RIA = '#e74c3c'  # Red
@@ -322,22 +312,10 @@ fT_default = 0.01
 epsilon_default = 1
 d_default = 1024
 
-# OUE formulas from Table 1
-def G_RPA_OUE(beta, r, fT, epsilon, d):
-    """RPA overall gain for OUE: β(r - f_T)"""
-    return beta * (r - fT)
-
-def G_RIA_OUE(beta, r, fT, epsilon, d):
-    """RIA overall gain for OUE: β(1 - f_T)"""
-    return beta * (1 - fT)
-
-def G_MGA_OUE(beta, r, fT, epsilon, d):
-    """MGA overall gain for OUE: β(2r - f_T) + 2βr/(e^ε - 1)"""
-    return beta * (2*r - fT) + (2 * beta * r) / (np.exp(epsilon) - 1)
-
-def normalized_gain(G, fT):
-    """Normalized overall gain: (G + f_T) / f_T"""
-    return (G + fT) / fT
+# OUE formulas from Table 1 (shared registry in ldp.protocols)
+G_RPA_OUE = PROTOCOLS['OUE'].attack_gain('RPA')
+G_RIA_OUE = PROTOCOLS['OUE'].attack_gain('RIA')
+G_MGA_OUE = PROTOCOLS['OUE'].attack_gain('MGA')
 
 # Parameter ranges
 beta_range = np.logspace(-3, -1, 20)
@@ -489,6 +467,9 @@ import matplotlib.pyplot as plt
 from matplotlib.ticker import LogLocator, NullFormatter, ScalarFormatter
 import matplotlib
 
+from ldp.gains import normalized_gain
+from ldp.protocols import compute_gains_OLH  # Table 1
+
 # Use a clean style matching the original
 plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.size'] = 10
@@ -503,31 +484,11 @@ DEFAULT_FT = 0.01
 DEFAULT_EPSILON = 1
 DEFAULT_D = 1024  # From Section 5.1: Zipf dataset has 1,024 items by default
 
-def compute_gains_OLH(beta, r, f_T, epsilon, d):
-    """
-    Compute overall gains for the three attacks on OLH.
-    
-    From Table 1:
-    - RPA: -β*f_T
-    - RIA: β(1 - f_T)
-    - MGA: β(2r - f_T) + 2βr/(e^ε - 1)
-    """
-    e_eps = np.exp(epsilon)
-    
-    G_RPA = -beta * f_T
-    G_RIA = beta * (1 - f_T)
-    G_MGA = beta * (2*r - f_T) + (2 * beta * r) / (e_eps - 1)
-    
-    return G_RPA, G_RIA, G_MGA
-
 def compute_normalized_gains(G_RPA, G_RIA, G_MGA, f_T):
     """
     Normalized overall gain = (G + f_T) / f_T
     """
-    norm_RPA = (G_RPA + f_T) / f_T
-    norm_RIA = (G_RIA + f_T) / f_T
-    norm_MGA = (G_MGA + f_T) / f_T
-    return norm_RPA, norm_RIA, norm_MGA
+    return tuple(normalized_gain(G, f_T) for G in (G_RPA, G_RIA, G_MGA))
 
 # Parameter ranges based on Figure 3
 beta_range = np.logspace(-3, -1, 20)  # 10^-3 to 10^-1
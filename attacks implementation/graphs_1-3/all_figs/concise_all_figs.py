@@ -3,9 +3,16 @@ Recreate Figures 1, 2, and 3 from "Data Poisoning Attacks to Local Differential
 Concise version with consolidated code for all three protocols: kRR, OUE, and OLH
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))  # repo root, for the ldp package
+from ldp.executor import run_tasks
+from ldp.gains import DEFAULTS, RANGES, compute_gains  # Table 2 defaults and the ranges of Figures 1-3
+
 # Styling
 plt.rcParams.update({'font.family': 'sans-serif', 'font.size': 10, 'axes.linewidth': 0.8,
                      'xtick.major.width': 0.8, 'ytick.major.width': 0.8})
@@ -16,59 +23,11 @@ MARKERS = {'RPA': 'o', 'RIA': 'x', 'MGA': 's'}
 LINES = {'RPA': '-', 'RIA': '--', 'MGA': ':'}
 SIZES = {'RPA': 5, 'RIA': 7, 'MGA': 5}
 
-# Default parameters (Table 2)
-DEFAULTS = {'beta': 0.05, 'r': 1, 'fT': 0.01, 'epsilon': 1, 'd': 1024}
-
-# Parameter ranges
-RANGES = {
-    'beta': np.logspace(-3, -1, 20),
-    'r': np.array([1, 5, 10, 15, 20]),
-    'fT': np.logspace(-3, -1, 20),
-    'epsilon': np.linspace(0.5, 3.0, 20),
-    'd': 2**np.arange(4, 13)
-}
-
-# Gain formulas from Table 1
-def compute_gains_kRR(beta, r, fT, epsilon, d):
-    """kRR: RPA=β(r/d-fT), RIA=β(1-fT), MGA=β(1-fT)+β(d-r)/(e^ε-1)"""
-    e_eps = np.exp(epsilon)
-    return (beta * (r/d - fT), beta * (1 - fT), beta * (1 - fT) + beta * (d - r) / (e_eps - 1))
-
-def compute_gains_OUE(beta, r, fT, epsilon, d):
-    """OUE: RPA=β(r-fT), RIA=β(1-fT), MGA=β(2r-fT)+2βr/(e^ε-1)"""
-    return (beta * (r - fT), beta * (1 - fT), beta * (2*r - fT) + 2*beta*r / (np.exp(epsilon) - 1))
-
-def compute_gains_OLH(beta, r, fT, epsilon, d):
-    """OLH: RPA=-β*fT, RIA=β(1-fT), MGA=β(2r-fT)+2βr/(e^ε-1)"""
-    e_eps = np.exp(epsilon)
-    return (-beta * fT, beta * (1 - fT), beta * (2*r - fT) + 2*beta*r / (e_eps - 1))
-
-def normalized_gain(G, fT):
-    """Normalized overall gain: (G + fT) / fT"""
-    return (G + fT) / fT
-
-def compute_all_gains(protocol_func, param_name, param_range, use_varying_fT=False):
-    """Compute gains across a parameter range"""
-    gains = {'RPA': [], 'RIA': [], 'MGA': []}
-    
-    for i, param_val in enumerate(param_range):
-        params = DEFAULTS.copy()
-        params[param_name] = param_val
-        
-        G_RPA, G_RIA, G_MGA = protocol_func(**params)
-        gains['RPA'].append(G_RPA)
-        gains['RIA'].append(G_RIA)
-        gains['MGA'].append(G_MGA)
-    
-    # Convert to arrays
-    for key in gains:
-        gains[key] = np.array(gains[key])
-    
-    # Compute normalized gains
-    fT_for_norm = param_range if use_varying_fT else DEFAULTS['fT']
-    norm_gains = {key: normalized_gain(gains[key], fT_for_norm) for key in gains}
-    
-    return gains, norm_gains
+def compute_all_gains(protocol_func, param_name, param_range):
+    """Compute gains across a parameter range in one broadcast call (fT normalization follows the varied fT)"""
+    params = DEFAULTS.copy()
+    params[param_name] = param_range
+    return compute_gains(protocol_func, **params)
 
 def plot_row(ax, x_data, gains, xlabel, xscale, row_type, use_xticks=None, markevery=1):
     """Plot a single subplot"""
@@ -129,8 +88,7 @@ def create_figure(protocol_func, protocol_name, use_log_for_oue=False):
     ]
     
     for col, (param_name, xlabel, xscale, xticks, markevery) in enumerate(param_configs):
-        use_varying_fT = (param_name == 'fT')
-        gains, norm_gains = compute_all_gains(protocol_func, param_name, RANGES[param_name], use_varying_fT)
+        gains, norm_gains = compute_all_gains(protocol_func, param_name, RANGES[param_name])
         
         # Top row: Overall gains
         if use_log_for_oue:
@@ -163,21 +121,21 @@ def create_figure(protocol_func, protocol_name, use_log_for_oue=False):
     
     return fig
 
-# Generate all three figures
-print("Generating Figure 1 (kRR)...")
-fig1 = create_figure(compute_gains_kRR, 'kRR', use_log_for_oue=False)
-fig1.savefig('fig1_recreated.png', dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-print("✓ Figure 1 saved!")
+# Figure number and log-scale layout per protocol
+FIGURES = {'kRR': (1, False), 'OUE': (2, True), 'OLH': (3, False)}
 
-print("Generating Figure 2 (OUE)...")
-fig2 = create_figure(compute_gains_OUE, 'OUE', use_log_for_oue=True)
-fig2.savefig('fig2_recreated.png', dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-print("✓ Figure 2 saved!")
+def save_figure(protocol):
+    """Create and save the figure of one protocol (runs as a process-pool task)"""
+    number, use_log = FIGURES[protocol]
+    fig = create_figure(protocol, protocol, use_log_for_oue=use_log)
+    fig.savefig(f'fig{number}_recreated.png', dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
+    plt.close(fig)
+    return number
 
-print("Generating Figure 3 (OLH)...")
-fig3 = create_figure(compute_gains_OLH, 'OLH', use_log_for_oue=False)
-fig3.savefig('fig3_recreated.png', dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-print("✓ Figure 3 saved!")
+# Render and save the three figures in parallel, one per worker process
+if __name__ == '__main__':
+    print("Generating Figures 1-3 (kRR, OUE, OLH)...")
+    for result in run_tasks(save_figure, list(FIGURES)):
+        print(f"✓ Figure {result.value} ({result.task}) saved in {result.seconds:.2f}s")
 
-plt.close('all')
-print("\n✅ All figures generated successfully!")
+    print("\n✅ All figures generated successfully!")
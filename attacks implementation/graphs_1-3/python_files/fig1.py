@@ -21,11 +21,18 @@ KEY INSIGHT: When varying any parameter, f_T stays constant at 0.01 for both
 G calculation and normalization. This keeps RIA and MGA constant when varying r.
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import LogLocator, NullFormatter, ScalarFormatter
 import matplotlib
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))  # repo root, for the ldp package
+from ldp.gains import normalized_gain
+from ldp.protocols import compute_gains_kRR  # Table 1
+
 # Use a clean style matching the original
 plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.size'] = 10
@@ -40,31 +47,11 @@ DEFAULT_FT = 0.01
 DEFAULT_EPSILON = 1
 DEFAULT_D = 1024  # From Section 5.1: Zipf dataset has 1,024 items by default
 
-def compute_gains_kRR(beta, r, f_T, epsilon, d):
-    """
-    Compute overall gains for the three attacks on kRR.
-    
-    From Table 1:
-    - RPA: β(r/d - f_T)
-    - RIA: β(1 - f_T)
-    - MGA: β(1 - f_T) + β(d-r)/(e^ε - 1)
-    """
-    e_eps = np.exp(epsilon)
-    
-    G_RPA = beta * (r / d - f_T)
-    G_RIA = beta * (1 - f_T)
-    G_MGA = beta * (1 - f_T) + beta * (d - r) / (e_eps - 1)
-    
-    return G_RPA, G_RIA, G_MGA
-
 def compute_normalized_gains(G_RPA, G_RIA, G_MGA, f_T):
     """
     Normalized overall gain = (G + f_T) / f_T
     """
-    norm_RPA = (G_RPA + f_T) / f_T
-    norm_RIA = (G_RIA + f_T) / f_T
-    norm_MGA = (G_MGA + f_T) / f_T
-    return norm_RPA, norm_RIA, norm_MGA
+    return tuple(normalized_gain(G, f_T) for G in (G_RPA, G_RIA, G_MGA))
 
 # Parameter ranges based on Figure 1
 beta_range = np.logspace(-3, -1, 20)  # 10^-3 to 10^-1
@@ -1,6 +1,13 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))  # repo root, for the ldp package
+from ldp.gains import normalized_gain
+from ldp.protocols import PROTOCOLS
+
 # New color scheme - different from original paper
 color_RPA = '#9467bd'  # Purple
 color_RIA = '#e74c3c'  # Red
@@ -23,22 +30,10 @@ fT_default = 0.01
 epsilon_default = 1
 d_default = 1024
 
-# OUE formulas from Table 1
-def G_RPA_OUE(beta, r, fT, epsilon, d):
-    """RPA overall gain for OUE: β(r - f_T)"""
-    return beta * (r - fT)
-
-def G_RIA_OUE(beta, r, fT, epsilon, d):
-    """RIA overall gain for OUE: β(1 - f_T)"""
-    return beta * (1 - fT)
-
-def G_MGA_OUE(beta, r, fT, epsilon, d):
-    """MGA overall gain for OUE: β(2r - f_T) + 2βr/(e^ε - 1)"""
-    return beta * (2*r - fT) + (2 * beta * r) / (np.exp(epsilon) - 1)
-
-def normalized_gain(G, fT):
-    """Normalized overall gain: (G + f_T) / f_T"""
-    return (G + fT) / fT
+# OUE formulas from Table 1 (shared registry in ldp.protocols)
+G_RPA_OUE = PROTOCOLS['OUE'].attack_gain('RPA')
+G_RIA_OUE = PROTOCOLS['OUE'].attack_gain('RIA')
+G_MGA_OUE = PROTOCOLS['OUE'].attack_gain('MGA')
 
 # Parameter ranges
 beta_range = np.logspace(-3, -1, 20)
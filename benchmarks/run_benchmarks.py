@@ -0,0 +1,185 @@
+"""
+Benchmarks for gain computation and figure generation.
+
+Times, on fixed parameter grids:
+- the original per-point compute_all_gains loop (a verbatim copy of the baseline code)
+  vs the vectorized ldp.gains engine
+- large broadcast grids in float64 and float32
+- create_figure from concise_all_figs.py and savefig to PNG and SVG
+
+Each case is repeated with timeit and the results are written as JSON together
+with the environment, so two runs (e.g. two versions) can be compared with
+--compare.
+
+Usage: python benchmarks/run_benchmarks.py [--repeat N] [--filter TEXT] [--output FILE] [--compare OLD.json]
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))  # repo root, for the ldp package
+from ldp.gains import DEFAULTS, PARAMS, RANGES, compute_gains
+from ldp.protocols import PROTOCOLS
+
+FIGURE_SCRIPT = ROOT / 'attacks implementation' / 'graphs_1-3' / 'all_figs' / 'concise_all_figs.py'
+
+# Fixed grid for the large-array cases: 1000 beta values x 1000 epsilon values
+GRID = {'beta': np.logspace(-3, -1, 1000)[:, None], 'epsilon': np.linspace(0.5, 3.0, 1000)}
+
+
+def load_figure_script():
+    """Import concise_all_figs.py as a module (its figure generation is behind __main__)"""
+    spec = importlib.util.spec_from_file_location('concise_all_figs', FIGURE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The baseline formulas and compute_all_gains loop of concise_all_figs.py before the gain engine,
+# copied verbatim so the loop case measures what the repository had, not today's registry
+def baseline_gains_kRR(beta, r, fT, epsilon, d):
+    """kRR: RPA=β(r/d-fT), RIA=β(1-fT), MGA=β(1-fT)+β(d-r)/(e^ε-1)"""
+    e_eps = np.exp(epsilon)
+    return (beta * (r/d - fT), beta * (1 - fT), beta * (1 - fT) + beta * (d - r) / (e_eps - 1))
+
+
+def baseline_gains_OUE(beta, r, fT, epsilon, d):
+    """OUE: RPA=β(r-fT), RIA=β(1-fT), MGA=β(2r-fT)+2βr/(e^ε-1)"""
+    return (beta * (r - fT), beta * (1 - fT), beta * (2*r - fT) + 2*beta*r / (np.exp(epsilon) - 1))
+
+
+def baseline_gains_OLH(beta, r, fT, epsilon, d):
+    """OLH: RPA=-β*fT, RIA=β(1-fT), MGA=β(2r-fT)+2βr/(e^ε-1)"""
+    e_eps = np.exp(epsilon)
+    return (-beta * fT, beta * (1 - fT), beta * (2*r - fT) + 2*beta*r / (e_eps - 1))
+
+
+BASELINE_GAINS = {'kRR': baseline_gains_kRR, 'OUE': baseline_gains_OUE, 'OLH': baseline_gains_OLH}
+
+
+def baseline_all_gains(protocol_func, param_name, param_range, use_varying_fT=False):
+    """Compute gains across a parameter range"""
+    gains = {'RPA': [], 'RIA': [], 'MGA': []}
+
+    for i, param_val in enumerate(param_range):
+        params = DEFAULTS.copy()
+        params[param_name] = param_val
+
+        G_RPA, G_RIA, G_MGA = protocol_func(**params)
+        gains['RPA'].append(G_RPA)
+        gains['RIA'].append(G_RIA)
+        gains['MGA'].append(G_MGA)
+
+    # Convert to arrays
+    for key in gains:
+        gains[key] = np.array(gains[key])
+
+    # Compute normalized gains
+    fT_for_norm = param_range if use_varying_fT else DEFAULTS['fT']
+    norm_gains = {key: (gains[key] + fT_for_norm) / fT_for_norm for key in gains}
+
+    return gains, norm_gains
+
+
+def loop_gains(protocol):
+    """The original per-point loop over every figure column, as create_figure ran it"""
+    return {param_name: baseline_all_gains(BASELINE_GAINS[protocol], param_name, RANGES[param_name],
+                                           param_name == 'fT')
+            for param_name in PARAMS}
+
+
+def vectorized_gains(protocol):
+    """Every figure column through the broadcasting engine"""
+    return {param_name: compute_gains(protocol, **{param_name: RANGES[param_name]}) for param_name in PARAMS}
+
+
+def benchmark_cases(name_filter=''):
+    """(name, callable) pairs whose name contains `name_filter`, in a fixed order"""
+    cases = []
+    for protocol in PROTOCOLS:
+        cases.append((f'gains/loop/{protocol}', lambda p=protocol: loop_gains(p)))
+        cases.append((f'gains/vectorized/{protocol}', lambda p=protocol: vectorized_gains(p)))
+        for dtype in (np.float64, np.float32):
+            cases.append((f'gains/grid-1e6-{dtype.__name__}/{protocol}',
+                          lambda p=protocol, t=dtype: compute_gains(p, **GRID, dtype=t)))
+
+    figure_cases = [f'figure/create/{protocol}' for protocol in PROTOCOLS]
+    figure_cases += [f'figure/savefig-{fmt}/kRR' for fmt in ('png', 'svg')]
+    if any(name_filter in name for name in figure_cases):
+        figs = load_figure_script()
+
+        def create(protocol):
+            plt.close(figs.create_figure(protocol, protocol, use_log_for_oue=(protocol == 'OUE')))
+
+        for protocol in PROTOCOLS:
+            cases.append((f'figure/create/{protocol}', lambda p=protocol: create(p)))
+        for fmt in ('png', 'svg'):
+            if name_filter in f'figure/savefig-{fmt}/kRR':
+                fig = figs.create_figure('kRR', 'kRR')
+                cases.append((f'figure/savefig-{fmt}/kRR',
+                              lambda f=fig, t=fmt: f.savefig(io.BytesIO(), format=t, dpi=150, bbox_inches='tight')))
+
+    return [(name, func) for name, func in cases if name_filter in name]
+
+
+def run_case(func, repeat):
+    """Per-call seconds over `repeat` timeit rounds, with the loop count picked by autorange"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat, number)]
+    return {'number': number, 'repeat': repeat, 'min': min(times), 'median': statistics.median(times),
+            'max': max(times)}
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'matplotlib': matplotlib.__version__,
+            'platform': platform.platform(), 'machine': platform.machine(), 'commit': commit or None,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='timeit rounds per case')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--output', default='bench_results.json', help='JSON file to write')
+    parser.add_argument('--compare', help='earlier JSON results to compare medians against')
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        previous = {case['name']: case for case in json.loads(Path(args.compare).read_text())['results']}
+
+    results = []
+    for name, func in benchmark_cases(args.filter):
+        result = {'name': name, **run_case(func, args.repeat)}
+        results.append(result)
+        line = f"{name:<40} median {result['median'] * 1e3:10.3f} ms   min {result['min'] * 1e3:10.3f} ms"
+        if name in previous:
+            line += f"   x{result['median'] / previous[name]['median']:.2f} vs {args.compare}"
+        print(line)
+
+    Path(args.output).write_text(json.dumps({'environment': environment(), 'results': results}, indent=2))
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
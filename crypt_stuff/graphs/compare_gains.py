@@ -1,5 +1,11 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for the ldp package
+from ldp.protocols import compute_gains_kRR, compute_gains_OUE, compute_gains_OLH
+
 # Parameters from table 2
 DEFAULTS = {
     'beta': 0.05,
@@ -37,33 +43,10 @@ print(f"OUE MGA: {my_compute_gains_OUE(**DEFAULTS):.6f}")
 print(f"OLH MGA: {my_compute_gains_OLH(**DEFAULTS):.6f}")
 print()
 
-# Original implementation from notebook
-print("ORIGINAL IMPLEMENTATION:")
+# Shared implementation (Table 1 registry in ldp.protocols, used by the notebook)
+print("REGISTRY IMPLEMENTATION (ldp.protocols):")
 print("-"*60)
 
-def compute_gains_kRR(beta, r, fT, epsilon, d):
-    e_eps = np.exp(epsilon)
-    return (
-        beta * (r/d - fT),                                # RPA
-        beta * (1 - fT),                                  # RIA
-        beta * (1 - fT) + beta * (d - r) / (e_eps - 1)    # MGA
-    )
-
-def compute_gains_OUE(beta, r, fT, epsilon, d):
-    return (
-        beta * (r - fT),
-        beta * (1 - fT),
-        beta * (2*r - fT) + 2*beta*r / (np.exp(epsilon) - 1)
-    )
-
-def compute_gains_OLH(beta, r, fT, epsilon, d):
-    e_eps = np.exp(epsilon)
-    return (
-        -beta * fT,
-        beta * (1 - fT),
-        beta * (2*r - fT) + 2*beta*r / (e_eps - 1)
-    )
-
 rpa, ria, mga = compute_gains_kRR(**DEFAULTS)
 print(f"kRR - RPA: {rpa:.6f}, RIA: {ria:.6f}, MGA: {mga:.6f}")
 
@@ -78,7 +61,7 @@ print("="*60)
 print("ANALYSIS")
 print("="*60)
 print("✓ Formulas are IDENTICAL")
-print("✓ My implementation correctly extracts only MGA from original")
+print("✓ My implementation correctly extracts only MGA from the registry")
 print()
 print("If curves differ, check:")
 print("1. Parameter ranges used")
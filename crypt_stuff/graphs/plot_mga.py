@@ -2,9 +2,15 @@
 Plot MGA (Mean Gain Advantage) vs parameters for kRR, OUE, and OLH protocols
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for the ldp package
+from ldp.gains import compute_gains
+
 # Parameters from table 2 in the paper
 DEFAULTS = {
     'beta': 0.05,
@@ -36,45 +42,13 @@ COLOR_MGA = '#17becf'
 LINE_MGA = '-'
 
 
-# Gain computation functions
-def compute_gains_kRR(beta, r, fT, epsilon, d):
-    """Compute gains for kRR protocol"""
-    e_eps = np.exp(epsilon)
-    G_MGA = beta * (1 - fT) + beta * (d - r) / (e_eps - 1)
-    return G_MGA
-
-
-def compute_gains_OUE(beta, r, fT, epsilon, d):
-    """Compute gains for OUE protocol"""
-    G_MGA = beta * (2*r - fT) + 2*beta*r / (np.exp(epsilon) - 1)
-    return G_MGA
-
-
-def compute_gains_OLH(beta, r, fT, epsilon, d):
-    """Compute gains for OLH protocol"""
-    e_eps = np.exp(epsilon)
-    G_MGA = beta * (2*r - fT) + 2*beta*r / (e_eps - 1)
-    return G_MGA
-
+def compute_mga_for_param(protocol_name, param_name, param_range):
+    """Compute MGA gains for varying a single parameter (Table 1 formulas from ldp.protocols)"""
+    params = DEFAULTS.copy()
+    params[param_name] = param_range
+    gains, _ = compute_gains(protocol_name, **params)
 
-def normalized_gain(G, fT):
-    """Compute normalized gain"""
-    return (G + fT) / fT
-
-
-def compute_mga_for_param(protocol_func, param_name, param_range, use_varying_fT=False):
-    """Compute MGA gains for varying a single parameter"""
-    mga_gains = []
-
-    for param_val in param_range:
-        params = DEFAULTS.copy()
-        params[param_name] = param_val
-        G_MGA = protocol_func(**params)
-        mga_gains.append(G_MGA)
-
-    mga_gains = np.array(mga_gains)
-
-    return mga_gains
+    return gains['MGA']
 
 
 def plot_mga_panel(ax, x_data, y_data, xlabel, xscale, ylabel, use_xticks=None, markevery=1):
@@ -95,7 +69,7 @@ def plot_mga_panel(ax, x_data, y_data, xlabel, xscale, ylabel, use_xticks=None,
     ax.set_yticklabels([])
 
 
-def create_mga_figure(protocol_func, protocol_name, param_configs):
+def create_mga_figure(protocol_name, param_configs):
     """Create a figure with MGA plots for multiple parameters - absolute gains only"""
     n_params = len(param_configs)
     fig, axes = plt.subplots(1, n_params, figsize=(4*n_params, 4))
@@ -104,11 +78,7 @@ def create_mga_figure(protocol_func, protocol_name, param_configs):
         axes = [axes]
 
     for col, (param_name, xlabel, xscale, xticks, markevery) in enumerate(param_configs):
-        use_varying_fT = (param_name == 'fT')
-
-        mga_gains = compute_mga_for_param(
-            protocol_func, param_name, RANGES[param_name], use_varying_fT
-        )
+        mga_gains = compute_mga_for_param(protocol_name, param_name, RANGES[param_name])
 
         # Plot absolute gains
         plot_mga_panel(
@@ -139,7 +109,7 @@ if __name__ == '__main__':
         ('d', r'$d$', 'linear', None, 1)
     ]
 
-    fig_kRR = create_mga_figure(compute_gains_kRR, 'kRR', param_configs_kRR)
+    fig_kRR = create_mga_figure('kRR', param_configs_kRR)
     fig_kRR.savefig('mga_kRR.png', dpi=300, bbox_inches='tight', transparent=True)
     print("Saved: mga_kRR.png")
 
@@ -152,7 +122,7 @@ if __name__ == '__main__':
         ('epsilon', r'$\varepsilon$', 'linear', [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], 2)
     ]
 
-    fig_OUE = create_mga_figure(compute_gains_OUE, 'OUE', param_configs_OUE)
+    fig_OUE = create_mga_figure('OUE', param_configs_OUE)
     fig_OUE.savefig('mga_OUE.png', dpi=300, bbox_inches='tight', transparent=True)
     print("Saved: mga_OUE.png")
 
@@ -165,7 +135,7 @@ if __name__ == '__main__':
         ('epsilon', r'$\varepsilon$', 'linear', [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], 2)
     ]
 
-    fig_OLH = create_mga_figure(compute_gains_OLH, 'OLH', param_configs_OLH)
+    fig_OLH = create_mga_figure('OLH', param_configs_OLH)
     fig_OLH.savefig('mga_OLH.png', dpi=300, bbox_inches='tight', transparent=True)
     print("Saved: mga_OLH.png")
 
@@ -0,0 +1,32 @@
+"""
+Local differential privacy (LDP) protocols and data poisoning attacks.
+
+Shared, importable code behind the figure scripts and notebooks that recreate
+"Data Poisoning Attacks to Local Differential Privacy Protocols".
+"""
+
+from ldp.protocols import (ATTACKS, PROTOCOLS, Protocol, compute_gains_kRR, compute_gains_OLH,
+                           compute_gains_OUE, get_protocol, register)
+from ldp.gains import (DEFAULTS, PARAMS, RANGES, broadcast_params, compute_gains, normalized_gain,
+                       resolve_params)
+from ldp.attacks import GENERATORS, fake_counts, fake_reports, mga_buckets, mga_decoys, oue_target_row
+from ldp.datasets import (DATASETS, Dataset, Population, generate_users, get_dataset, item_frequencies, load_dataset,
+                          zipf_weights)
+from ldp.detection import Detection, cooccurrence, detect_fake_users, vertical_bitsets
+from ldp.estimation import estimate_frequencies
+from ldp.executor import Task, TaskResult, experiment_tasks, figure_gains, gain_column, run_tasks
+from ldp.inverse import required_beta, required_epsilon, required_r
+from ldp.krr import aggregate_krr, estimate_krr, krr_params, perturb_krr, simulate_krr, simulate_krr_counts
+from ldp.olh import (aggregate_olh, bucket_dtype, estimate_olh, hash_items, olh_params, perturb_olh,
+                     simulate_olh, support_counts_olh)
+from ldp.oue import (bitwise_count, chunk_users, estimate_oue, oue_params, packed_width, perturb_oue,
+                     popcount, simulate_oue, simulate_oue_counts, support_counts, unpack_reports)
+from ldp.pem import PEMLevel, PEMResult, pem, prefix_lengths, success_rate, top_k
+from ldp.postprocess import (DEFENSES, base_cut, base_cut_threshold, norm_sub, normalize, postprocess,
+                             project_simplex)
+from ldp.pareto import objective_surfaces, pareto_frontier, worst_case_gain
+from ldp.validation import Validation, defended_gains, measured_gain, population, summarize, validate_figures
+from ldp.sampling import AliasTable, alias_sample, alias_table, item_dtype
+from ldp.seeding import SEED, chunk_rngs, seed_sequence, task_rng, task_seed
+from ldp.streaming import OLH_DTYPE, StreamAggregator, aggregate_stream, iter_npy, merge_files, olh_records
+from ldp.sweep import SweepChunk, SweepStore, aiter_sweep, iter_sweep, load_sweep, run_sweep
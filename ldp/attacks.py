@@ -0,0 +1,222 @@
+"""
+Batch fake-report generators for the RPA, RIA and MGA poisoning attacks.
+
+Vectorized replacement for the per-user loops in `simulateScenario`
+(demo_tests/demo.html) and `simulateAttackSet` (demo_tests/krr3_demo.html).
+`fake_reports` emits all m crafted reports at once, in the same format as the
+matching simulator (kRR items, packed OUE rows, OLH (seeds, buckets)), and
+`fake_counts` returns their aggregate support counts, sampled exactly in
+count space for kRR and OUE.
+
+  RPA  uniform random value from the protocol's output space
+  RIA  a uniformly chosen target item, perturbed honestly
+  MGA  a report crafted to support the targets: a target item for kRR; all
+       target bits plus l = floor(p + (d-1)q - r) random decoy bits for OUE,
+       so the report has the expected number of 1s; for OLH the bucket
+       shared by the most targets under the best of `candidates` fresh
+       random seeds, searched independently by every fake user
+
+OLH MGA hashes the r targets under m x `candidates` seeds, generated and
+scored in chunks; like the paper it searches a finite number of random seeds
+rather than the seed maximizing the number of targets in one bucket. The OUE
+target bit row does not depend on the trial and is cached per (targets, d).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from ldp.krr import perturb_krr, simulate_krr_counts
+from ldp.olh import bucket_dtype, hash_items, olh_params, perturb_olh, support_counts_olh
+from ldp.oue import chunk_users, oue_params, packed_width, perturb_oue, simulate_oue_counts
+
+CANDIDATES = 1000
+
+
+def _targets(targets):
+    return tuple(int(t) for t in np.atleast_1d(targets))
+
+
+def mga_decoys(d, r, epsilon):
+    """Decoy bits per OUE MGA report: floor(p + (d-1)q - r), the expected support size minus r"""
+    p, q = oue_params(epsilon)
+    return max(0, int(p + (d - 1) * q - r))
+
+
+@lru_cache(maxsize=None)
+def oue_target_row(targets, d):
+    """Boolean length-d row with the target bits set (read-only, shared across trials)"""
+    row = np.zeros(d, dtype=bool)
+    row[list(targets)] = True
+    row.flags.writeable = False
+    return row
+
+
+def mga_buckets(seeds, targets, d_prime):
+    """(buckets, hits): per seed, the bucket holding the most targets and how many it holds"""
+    seeds, targets = np.asarray(seeds), np.asarray(targets)
+    # one plane of buckets per target, so counting a bucket sums whole planes
+    hashed = hash_items(seeds, targets.reshape((-1,) + (1,) * seeds.ndim), d_prime)
+    hits = np.zeros(seeds.shape, dtype=np.min_scalar_type(len(targets)))
+    buckets = np.zeros(seeds.shape, dtype=bucket_dtype(d_prime))
+    count, equal = np.empty_like(hits), np.empty(hashed.shape, dtype=bool)
+    for bucket in range(d_prime):
+        np.equal(hashed, bucket, out=equal)
+        equal.sum(axis=0, dtype=hits.dtype, out=count)
+        better = count > hits
+        np.copyto(hits, count, where=better)
+        np.copyto(buckets, bucket, where=better)
+    return buckets, hits
+
+
+# kRR: reports are item indices
+
+def _krr_rpa(targets, d, m, epsilon, rng):
+    return rng.integers(0, d, size=m)
+
+
+def _krr_ria(targets, d, m, epsilon, rng):
+    return perturb_krr(rng.choice(targets, size=m), d, epsilon, rng)
+
+
+def _krr_mga(targets, d, m, epsilon, rng):
+    return rng.choice(targets, size=m)
+
+
+# OUE: reports are packed bit rows
+
+def _oue_rpa(targets, d, m, epsilon, rng):
+    packed = rng.integers(0, 256, size=(m, packed_width(d)), dtype=np.uint8)
+    if d % 8:
+        packed[:, -1] &= np.uint8(0xFF << (8 - d % 8) & 0xFF)  # clear the padding bits
+    return packed
+
+
+def _oue_ria(targets, d, m, epsilon, rng):
+    return perturb_oue(rng.choice(targets, size=m), d, epsilon, rng)
+
+
+def _oue_mga(targets, d, m, epsilon, rng, decoys=None):
+    row = oue_target_row(targets, d)
+    others = np.flatnonzero(~row)
+    l = mga_decoys(d, len(targets), epsilon) if decoys is None else decoys
+    out = np.empty((m, packed_width(d)), dtype=np.uint8)
+    chunk_size = chunk_users(d, None)
+    for start in range(0, m, chunk_size):
+        bits = np.tile(row, (min(chunk_size, m - start), 1))
+        if l:
+            # l distinct non-target items per report: the l smallest of uniform keys
+            picks = rng.random((len(bits), len(others)), dtype=np.float32).argpartition(l - 1, axis=1)[:, :l]
+            bits[np.arange(len(bits))[:, None], others[picks]] = True
+        out[start:start + len(bits)] = np.packbits(bits, axis=1)
+    return out
+
+
+# OLH: reports are (seeds, buckets)
+
+def _olh_rpa(targets, d, m, epsilon, rng):
+    d_prime = olh_params(epsilon)[0]
+    seeds = rng.integers(0, 1 << 32, size=m, dtype=np.uint32)
+    return seeds, rng.integers(0, d_prime, size=m, dtype=bucket_dtype(d_prime))
+
+
+def _olh_ria(targets, d, m, epsilon, rng):
+    return perturb_olh(rng.choice(targets, size=m), epsilon, rng)
+
+
+def _olh_mga(targets, d, m, epsilon, rng, candidates=CANDIDATES):
+    d_prime = olh_params(epsilon)[0]
+    seeds = np.empty(m, dtype=np.uint32)
+    buckets = np.empty(m, dtype=bucket_dtype(d_prime))
+    if len(targets) == 1:
+        candidates = 1  # every seed puts a single target in some bucket
+    # each fake user hashes the targets under `candidates` fresh seeds and keeps the best
+    chunk_size = max(1, (1 << 22) // (candidates * len(targets)))
+    for start in range(0, m, chunk_size):
+        cand = rng.integers(0, 1 << 32, size=(min(chunk_size, m - start), candidates), dtype=np.uint32)
+        cand_buckets, hits = mga_buckets(cand, targets, d_prime)
+        rows, best = np.arange(len(cand)), hits.argmax(axis=1)
+        seeds[start:start + len(cand)] = cand[rows, best]
+        buckets[start:start + len(cand)] = cand_buckets[rows, best]
+    return seeds, buckets
+
+
+GENERATORS = {
+    'kRR': {'RPA': _krr_rpa, 'RIA': _krr_ria, 'MGA': _krr_mga},
+    'OUE': {'RPA': _oue_rpa, 'RIA': _oue_ria, 'MGA': _oue_mga},
+    'OLH': {'RPA': _olh_rpa, 'RIA': _olh_ria, 'MGA': _olh_mga},
+}
+
+
+def fake_reports(protocol, attack, targets, d, m, epsilon, rng=None, **kwargs):
+    """
+    All m crafted reports of `attack` against `protocol`, in the simulator's report format.
+
+    Extra keyword arguments go to the generator: `decoys` for OUE MGA,
+    `candidates` for OLH MGA.
+    """
+    rng = np.random.default_rng(rng)
+    return GENERATORS[protocol][attack](_targets(targets), d, int(m), epsilon, rng, **kwargs)
+
+
+def _oue_mga_counts(targets, d, m, epsilon, rng, trials=None, decoys=None):
+    """
+    Exact support counts of m OUE MGA reports without building them.
+
+    Items are visited in turn while tracking how many reports still need k
+    decoys: with N non-target items left, each such report picks the current
+    item with probability k/N. That is one binomial per (item, k), O(d l)
+    work per trial instead of O(m d).
+    """
+    row = oue_target_row(targets, d)
+    others = np.flatnonzero(~row)
+    l = mga_decoys(d, len(targets), epsilon) if decoys is None else decoys
+    size = () if trials is None else (trials,)
+    counts = np.zeros(size + (d,), dtype=np.int64)
+    counts[..., row] = m
+    waiting = np.zeros(size + (l + 1,), dtype=np.int64)  # reports still needing k decoys
+    waiting[..., l] = m
+    k = np.arange(l + 1)
+    for left, item in zip(range(len(others), 0, -1), others):
+        picked = rng.binomial(waiting, np.minimum(k / left, 1))
+        counts[..., item] = picked.sum(axis=-1)
+        waiting -= picked
+        waiting[..., :-1] += picked[..., 1:]
+    return counts
+
+
+def _target_hist(targets, d, m, rng, size=None):
+    """Histogram of m items drawn uniformly from `targets`"""
+    hist = np.zeros(d if size is None else (size, d), dtype=np.int64)
+    hist[..., list(targets)] = rng.multinomial(m, np.full(len(targets), 1 / len(targets)), size=size)
+    return hist
+
+
+def fake_counts(protocol, attack, targets, d, m, epsilon, trials=None, rng=None, **kwargs):
+    """
+    Support counts of the m crafted reports, shape (d,) or (trials, d).
+
+    kRR and OUE are sampled exactly in count space, without building the
+    reports; OLH generates the reports and aggregates them.
+    """
+    rng = np.random.default_rng(rng)
+    targets, m = _targets(targets), int(m)
+    shape = (d,) if trials is None else (trials, d)
+    if protocol == 'kRR':
+        if attack == 'RPA':
+            return rng.multinomial(m, np.full(d, 1 / d), size=trials)
+        hist = _target_hist(targets, d, m, rng, trials)
+        if attack == 'MGA':
+            return hist
+        return np.stack([simulate_krr_counts(h, epsilon, rng=rng) for h in hist.reshape(-1, d)]).reshape(shape)
+    if protocol == 'OUE':
+        if attack == 'RPA':
+            return rng.binomial(m, 0.5, size=shape)
+        if attack == 'RIA':
+            hist = _target_hist(targets, d, m, rng, trials)
+            return np.stack([simulate_oue_counts(h, epsilon, rng=rng) for h in hist.reshape(-1, d)]).reshape(shape)
+        return _oue_mga_counts(targets, d, m, epsilon, rng, trials, **kwargs)
+
+    counts = [support_counts_olh(*fake_reports(protocol, attack, targets, d, m, epsilon, rng, **kwargs), d, epsilon)
+              for _ in range(1 if trials is None else trials)]
+    return counts[0] if trials is None else np.stack(counts)
@@ -0,0 +1,134 @@
+"""
+Synthetic user populations for the evaluation datasets of the attacks paper.
+
+Section 5.1 evaluates on three datasets (datasets/attacks_paper_datasets.md):
+
+  Zipf   1,024 items,    1,000,000 users, Zipf's distribution with s = 1.5
+  Fire     244 units,      548,868 users (SF Fire Department "Alarms" calls)
+  IPUMS    102 cities,     389,894 users (US census 2017)
+
+The Fire and IPUMS records are not shipped, so their populations are
+long-tailed stand-ins with the same number of items and users: a
+Zipf-Mandelbrot law 1/(rank + offset)^s, flatter for fire units and
+steeper for cities. Item 0 is the most popular. Users are drawn from an
+alias table (ldp.sampling), so generating a population costs one O(d) build
+and O(1) per user.
+
+`load_dataset` generates a population once and caches it as a directory of
+two .npy files:
+
+    users.npy  the item of every user, uint8/uint16/uint32 as d requires
+    hist.npy   the item histogram, int64
+
+Users are written chunk by chunk straight into a memory map and both files
+are moved into place only when complete, so an interrupted run never leaves
+a torn cache. Concurrent first loads (e.g. executor workers) each write their
+own temp directory and the first to finish wins. Later runs memory-map
+users.npy read-only, so startup costs milliseconds whatever the number of
+users. The cache key is the dataset's parameters, n and seed, so changing
+any of them generates a new population.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from ldp.sampling import alias_sample, alias_table, item_dtype
+from ldp.seeding import SEED, seed_sequence
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / 'datasets' / 'cache'
+USERS_FILE = 'users.npy'
+HIST_FILE = 'hist.npy'
+
+# Number of items and users, and the weights (s, offset) of 1/(rank + offset)^s.
+Dataset = namedtuple('Dataset', ['d', 'n', 's', 'offset'])
+
+# A loaded population: item per user (read-only memory map) and item histogram.
+Population = namedtuple('Population', ['name', 'd', 'users', 'hist'])
+
+DATASETS = {
+    'Zipf': Dataset(1024, 1_000_000, 1.5, 1),
+    'Fire': Dataset(244, 548_868, 1.1, 8),
+    'IPUMS': Dataset(102, 389_894, 1.3, 2),
+}
+
+
+def get_dataset(name):
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise KeyError(f"unknown dataset {name!r}, expected one of {list(DATASETS)}") from None
+
+
+def zipf_weights(d, s, offset=1):
+    """Item frequencies proportional to 1/(rank + offset)^s, rank 0 first"""
+    weights = (np.arange(d) + float(offset)) ** -float(s)
+    return weights / weights.sum()
+
+
+def item_frequencies(name):
+    """True item distribution of dataset `name`"""
+    dataset = get_dataset(name)
+    return zipf_weights(dataset.d, dataset.s, dataset.offset)
+
+
+def generate_users(name, n=None, rng=None, out=None):
+    """
+    Items of the n users (default: the dataset's own n) of dataset `name`.
+
+    Returns the smallest unsigned dtype holding the items; `out` and a
+    SeedSequence `rng` are handled as in ldp.sampling.alias_sample.
+    """
+    dataset = get_dataset(name)
+    return alias_sample(alias_table(item_frequencies(name)), dataset.n if n is None else n, rng, out=out)
+
+
+def cache_path(name, n=None, seed=SEED, cache_dir=CACHE_DIR):
+    """Cache directory of one generated population"""
+    dataset = get_dataset(name)
+    n = dataset.n if n is None else int(n)
+    return Path(cache_dir) / f'{name.lower()}_d{dataset.d}_s{dataset.s:g}_o{dataset.offset:g}_n{n}_seed{seed}'
+
+
+def write_population(path, name, n=None, seed=SEED):
+    """Generate a population into cache directory `path`, atomically"""
+    dataset = get_dataset(name)
+    n = dataset.n if n is None else int(n)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # a private temp directory per writer: concurrent cold loads never touch each other's files
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=path.name + '.'))
+    users = np.lib.format.open_memmap(tmp / USERS_FILE, mode='w+', dtype=item_dtype(dataset.d), shape=(n,))
+    generate_users(name, n, seed_sequence(seed, list(DATASETS).index(name)), out=users)
+    np.save(tmp / HIST_FILE, np.bincount(users, minlength=dataset.d).astype(np.int64))
+    users.flush()
+    del users
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not (path / USERS_FILE).exists():
+            raise
+        # another writer finished first; its population is identical
+
+
+def load_dataset(name, n=None, seed=SEED, cache_dir=CACHE_DIR):
+    """
+    Population of dataset `name`, generated on first use and memory-mapped from the cache afterwards.
+
+    `n` defaults to the dataset's own number of users; `seed` fixes the
+    population (ldp.seeding). `cache_dir=None` generates in memory without
+    caching.
+    """
+    dataset = get_dataset(name)
+    if cache_dir is None:
+        users = generate_users(name, n, seed_sequence(seed, list(DATASETS).index(name)))
+        return Population(name, dataset.d, users, np.bincount(users, minlength=dataset.d).astype(np.int64))
+    path = cache_path(name, n, seed, cache_dir)
+    if not (path / USERS_FILE).exists():
+        write_population(path, name, n, seed)
+    return Population(name, dataset.d, np.load(path / USERS_FILE, mmap_mode='r'), np.load(path / HIST_FILE))
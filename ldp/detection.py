@@ -0,0 +1,209 @@
+"""
+Frequent-itemset detection of MGA fake users in OUE and OLH reports.
+
+MGA fake reports all support the whole target set, so the targets are 1
+together in far more reports than genuine perturbation allows (Section 6.2
+of the attacks paper). An OLH report (seed, bucket) is read as the bit
+vector y_v = [H_seed(v) == bucket]. Detection makes three streaming passes
+over the reports, `chunk_size` rows at a time:
+
+  1. support counts of every item; the `max_items` best supported items are
+     the candidates (targets are among them: every fake report supports them)
+  2. vertical bitsets: one packed row of N bits per candidate item, so an
+     itemset's support is an AND of rows and a popcount (N/8 bytes per item)
+  3. with fake users found, their support counts are subtracted so the
+     estimate can be recomputed without them
+
+Instead of enumerating every frequent itemset (at ε = 1 every triple of items
+is frequent for OUE), candidate pairs whose co-occurrence exceeds the
+independence expectation c_i c_j / N by `pair_z` standard deviations are
+linked, and every connected group of linked items, peeled down to a dense
+core B (each item linked to at least half of the others), is tested. Let s_z
+be the number of reports supporting at least z items of B, and π_z the
+chance that a genuine report does (its own item with probability p, the
+others q each).
+s_z is abnormal when it reaches the paper's threshold, the smallest τ with
+N π_z (1 - π_z) / (τ - N π_z)^2 <= η; for z = |B| in OUE, π_z = p q^(z-1) as
+in the paper. Among abnormal z, the one maximizing s_z - 2 N π_z (fake
+reports caught minus genuine ones flagged) is kept and its reports are
+flagged. This also catches OLH MGA, whose searched seeds put most but rarely
+all targets in one bucket. As in the paper, r = 1 cannot be detected this way.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ldp.olh import hash_items, olh_params, support_counts_olh
+from ldp.oue import bitwise_count, chunk_users, oue_params, support_counts, unpack_reports
+from ldp.streaming import CHUNK_SIZE, StreamAggregator, iter_npy
+
+MAX_ITEMS = 64
+ETA = 0.01
+PAIR_Z = 6.0
+
+# Abnormal itemsets, the number of their items a report must support to be
+# flagged, that many reports and the threshold they passed, a boolean mask of
+# the flagged reports, and the support counts and report total without them.
+Detection = namedtuple('Detection', ['itemsets', 'min_items', 'supports', 'thresholds', 'fake', 'counts', 'n'])
+
+
+def genuine_tail(protocol, size, epsilon):
+    """π_z for z = 0..size: chance a genuine report supports at least z of `size` given items"""
+    if protocol == 'OUE':
+        p, q = oue_params(epsilon)
+    else:
+        _, p, q = olh_params(epsilon)
+    pmf = np.array([1 - p, p])
+    for _ in range(size - 1):
+        pmf = np.convolve(pmf, [1 - q, q])
+    return np.cumsum(pmf[::-1])[::-1]
+
+
+def abnormal_threshold(n, pi, eta=ETA):
+    """τ: support above which a count with genuine mean n π is abnormal at false positive rate at most η"""
+    mean = n * pi
+    return mean + np.sqrt(mean * (1 - pi) / eta)
+
+
+def _chunks(source, protocol, d, chunk_size):
+    """A fresh pass over `source`: a .npy path or a re-iterable collection of chunks"""
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        return iter_npy(source, chunk_size or (chunk_users(d, None) if protocol == 'OUE' else CHUNK_SIZE))
+    if iter(source) is source:
+        raise TypeError("detection makes several passes: pass a path or a re-iterable collection of chunks")
+    return iter(source)
+
+
+def _split(protocol, chunk):
+    if protocol == 'OUE':
+        return chunk, len(chunk)
+    seeds, buckets = (chunk['seed'], chunk['bucket']) if isinstance(chunk, np.ndarray) else chunk
+    return (seeds, buckets), len(seeds)
+
+
+def _item_bits(protocol, reports, items, d, epsilon):
+    """(len(items), rows) booleans: does each report support each item"""
+    if protocol == 'OUE':
+        return unpack_reports(reports, d)[:, items].T
+    seeds, buckets = reports
+    return hash_items(seeds, items[:, None], olh_params(epsilon)[0]) == buckets
+
+
+def vertical_bitsets(protocol, source, items, d, epsilon, chunk_size=None):
+    """Packed (len(items), ceil(N/8)) bitsets: bit u of row i is set when report u supports items[i]"""
+    rows, carry = [], np.zeros((len(items), 0), dtype=bool)
+    for chunk in _chunks(source, protocol, d, chunk_size):
+        reports, _ = _split(protocol, chunk)
+        bits = np.concatenate([carry, _item_bits(protocol, reports, items, d, epsilon)], axis=1)
+        whole = bits.shape[1] - bits.shape[1] % 8  # pack whole bytes, carry the rest into the next chunk
+        rows.append(np.packbits(bits[:, :whole], axis=1))
+        carry = bits[:, whole:]
+    rows.append(np.packbits(carry, axis=1))
+    return np.concatenate(rows, axis=1)
+
+
+def cooccurrence(bitsets):
+    """(k, k) counts of reports supporting both items of every pair (popcounts of ANDed rows)"""
+    k = len(bitsets)
+    counts = np.empty((k, k), dtype=np.int64)
+    for i in range(k):
+        counts[i, i:] = bitwise_count(bitsets[i] & bitsets[i:]).sum(axis=1, dtype=np.int64)
+        counts[i:, i] = counts[i, i:]
+    return counts
+
+
+def _hits(bitsets, block=1 << 16):
+    """Per report, how many of the bitset rows it supports (rows unpacked `block` bytes at a time)"""
+    hits = np.empty(bitsets.shape[1] * 8, dtype=np.min_scalar_type(len(bitsets)))
+    for start in range(0, bitsets.shape[1], block):
+        bits = np.unpackbits(bitsets[:, start:start + block], axis=1)
+        np.sum(bits, axis=0, out=hits[start * 8:start * 8 + bits.shape[1]])
+    return hits
+
+
+def _components(k, pairs):
+    """Connected groups (size >= 2) of the graph on k nodes with edges `pairs`"""
+    parent = list(range(k))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for a, b in pairs:
+        parent[find(a)] = find(b)
+    groups = {}
+    for a in range(k):
+        groups.setdefault(find(a), []).append(a)
+    return [np.array(g) for g in groups.values() if len(g) > 1]
+
+
+def _dense_core(group, adjacency):
+    """Peel the least linked items off `group` until each is linked to at least half of the others"""
+    group = np.asarray(group)
+    while len(group) > 2:
+        degree = adjacency[np.ix_(group, group)].sum(axis=1)
+        if degree.min() >= (len(group) - 1) / 2:
+            break
+        group = np.delete(group, np.argmin(degree))
+    return group
+
+
+def detect_fake_users(protocol, source, d, epsilon, max_items=MAX_ITEMS, eta=ETA, pair_z=PAIR_Z,
+                      chunk_size=None, max_workers=None):
+    """
+    Flag MGA fake users among OUE (packed rows) or OLH (seed, bucket) reports.
+
+    `source` is a .npy report file or a re-iterable collection of chunks in
+    the ldp.streaming formats. Returns a Detection; estimate from its
+    `counts` and `n` to remove the flagged users.
+    """
+    if protocol not in ('OUE', 'OLH'):
+        raise KeyError(f"fake-user detection is defined for OUE and OLH, not {protocol!r}")
+    agg = StreamAggregator(protocol, d, epsilon, max_workers).consume(_chunks(source, protocol, d, chunk_size))
+    n = agg.n
+    items = np.sort(np.argsort(agg.counts)[::-1][:max_items])
+
+    bitsets = vertical_bitsets(protocol, source, items, d, epsilon, chunk_size)
+    co = cooccurrence(bitsets)
+    support = np.diag(co).astype(float)
+    expected = np.outer(support, support) / max(n, 1)
+    excess = (co - expected) / np.sqrt(np.maximum(expected, 1))
+    adjacency = np.triu(excess > pair_z, k=1)
+    linked = np.argwhere(adjacency)
+    adjacency |= adjacency.T
+
+    itemsets, min_items, supports, thresholds = [], [], [], []
+    fake = np.zeros(bitsets.shape[1] * 8, dtype=bool)
+    for group in _components(len(items), linked):
+        group = _dense_core(group, adjacency)
+        hits = _hits(bitsets[group])[:n]
+        at_least = np.cumsum(np.bincount(hits, minlength=len(group) + 1)[::-1])[::-1]
+        pi = genuine_tail(protocol, len(group), epsilon)
+        z = np.arange(2, len(group) + 1)
+        abnormal = z[at_least[z] >= abnormal_threshold(n, pi[z], eta)]
+        if len(abnormal):
+            best = abnormal[np.argmax(at_least[abnormal] - 2 * n * pi[abnormal])]
+            itemsets.append(items[group])
+            min_items.append(int(best))
+            supports.append(int(at_least[best]))
+            thresholds.append(float(abnormal_threshold(n, pi[best], eta)))
+            fake[:n] |= hits >= best
+    fake = fake[:n]
+
+    counts = agg.counts.copy()
+    if fake.any():
+        start = 0
+        for chunk in _chunks(source, protocol, d, chunk_size):
+            reports, rows = _split(protocol, chunk)
+            flagged = fake[start:start + rows]
+            if flagged.any():
+                if protocol == 'OUE':
+                    counts -= support_counts(reports[flagged], d)
+                else:
+                    counts -= support_counts_olh(reports[0][flagged], reports[1][flagged], d, epsilon,
+                                                 max_workers=max_workers)
+            start += rows
+    return Detection(itemsets, min_items, supports, thresholds, fake, counts, n - int(fake.sum()))
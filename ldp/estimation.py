@@ -0,0 +1,15 @@
+"""
+Unbiased frequency estimation from support counts (Eq. image7/image8).
+
+Every protocol in ldp.protocols reduces a batch of reports to one support
+count per item; the estimate is then (count/n - q)/(p - q) with the
+protocol's own p and q.
+"""
+
+import numpy as np
+
+
+def estimate_frequencies(counts, n, p, q):
+    """Unbiased estimates (c/n - q)/(p - q); counts may carry leading trial axes"""
+    counts = np.asarray(counts, dtype=np.float64)
+    return (counts / n - q) / (p - q)
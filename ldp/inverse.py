@@ -0,0 +1,62 @@
+"""
+Closed-form inverse solvers for the Table 1 gains.
+
+Every registered gain is linear in beta, affine in r and affine in
+1/(e^ε - 1). Evaluating a protocol's own formula at two reference points
+therefore recovers the line's coefficients, and the parameter giving a
+requested gain follows in O(1) per scenario with no dense sweep. All inputs
+broadcast like ldp.gains.compute_gains; the result is NaN wherever the target
+cannot be reached inside the parameter's valid range.
+"""
+
+import numpy as np
+
+from ldp.gains import broadcast_params
+from ldp.protocols import get_protocol
+
+
+def _overall_target(target, fT, normalized):
+    """Overall gain G corresponding to `target` (normalized targets are (G + fT) / fT)"""
+    return fT * (target - 1) if normalized else target
+
+
+def _gain(protocol, attack, **params):
+    return get_protocol(protocol).gain(attack, **broadcast_params(**params))
+
+
+def required_beta(protocol, attack, target, normalized=False, r=None, fT=None, epsilon=None, d=None):
+    """Fraction of fake users beta with G(beta) = target; NaN outside 0 < beta <= 1"""
+    slope = _gain(protocol, attack, beta=1, r=r, fT=fT, epsilon=epsilon, d=d)
+    target = _overall_target(target, broadcast_params(fT=fT)['fT'], normalized)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = target / slope
+    return np.where((beta > 0) & (beta <= 1), beta, np.nan)
+
+
+def required_r(protocol, attack, target, normalized=False, beta=None, fT=None, epsilon=None, d=None):
+    """Number of target items r with G(r) = target; NaN outside 1 <= r <= d or where G ignores r"""
+    params = broadcast_params(beta=beta, fT=fT, epsilon=epsilon, d=d)
+    del params['r']
+    g0 = _gain(protocol, attack, r=0, **params)
+    slope = _gain(protocol, attack, r=1, **params) - g0
+    target = _overall_target(target, params['fT'], normalized)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = (target - g0) / slope
+    return np.where((r >= 1) & (r <= params['d']), r, np.nan)
+
+
+def required_epsilon(protocol, attack, target, normalized=False, beta=None, r=None, fT=None, d=None):
+    """Privacy budget epsilon with G(epsilon) = target; NaN where no epsilon > 0 reaches it or where G ignores epsilon"""
+    params = broadcast_params(beta=beta, r=r, fT=fT, d=d)
+    del params['epsilon']
+    # G = a + b / (e^ε - 1); e^ε - 1 is 1 at ε = ln 2 and 2 at ε = ln 3
+    g1 = _gain(protocol, attack, epsilon=np.log(2), **params)
+    g2 = _gain(protocol, attack, epsilon=np.log(3), **params)
+    b = 2 * (g1 - g2)
+    a = g1 - b
+    target = _overall_target(target, params['fT'], normalized)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = (target - a) / b  # 1 / (e^ε - 1)
+        epsilon = np.log1p(1 / inv)
+    # b = 0 where G ignores ε (RPA, RIA): inv is ±inf or NaN and no ε gives the target
+    return np.where(np.isfinite(inv) & (inv > 0), epsilon, np.nan)
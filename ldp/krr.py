@@ -0,0 +1,82 @@
+"""
+Vectorized kRR (k-ary randomized response) simulation.
+
+Python port of `privatizeKRR` and `estimateFrequenciesFromReports` from
+demo_tests/krr_demo.html. Users are perturbed in NumPy batches of
+`chunk_size` (keep the true item with probability p, otherwise report one of
+the other d - 1 items uniformly) and each batch is reduced with `bincount`, so
+memory stays bounded by the chunk whatever the number of users.
+
+When only the reported histogram matters, `simulate_krr_counts` samples it
+exactly from the true histogram without touching individual users. kRR
+reports item j with probability q + (p - q)[j = v], i.e. each user tells the
+truth with probability p - q and otherwise reports an item drawn uniformly from
+all d (d q = 1 - (p - q)). A trial is therefore one binomial per item for the
+truthful users plus a single d-way multinomial for everyone else: O(d) work
+per trial, independent of n.
+"""
+
+import numpy as np
+
+from ldp.estimation import estimate_frequencies
+from ldp.protocols import PROTOCOLS
+from ldp.seeding import chunk_rngs
+
+CHUNK_SIZE = 1 << 20
+
+
+def krr_params(epsilon, d):
+    """(p, q) = (e^ε/(e^ε+d-1), 1/(e^ε+d-1)) (Eq. image12)"""
+    return PROTOCOLS['kRR'].support_probs(epsilon, d)
+
+
+def perturb_krr(values, d, epsilon, rng=None):
+    """kRR reports for an array of true items in [0, d)"""
+    rng = np.random.default_rng(rng)
+    values = np.asarray(values)
+    p, _ = krr_params(epsilon, d)
+    # uniform over the other d - 1 items: draw from [0, d-1) and skip the true item
+    others = rng.integers(0, d - 1, size=values.shape, dtype=values.dtype)
+    others += others >= values
+    return np.where(rng.random(values.shape) < p, values, others)
+
+
+def aggregate_krr(reports, d):
+    """Support counts: how many reports name each item"""
+    return np.bincount(np.asarray(reports).ravel(), minlength=d)
+
+
+def simulate_krr(values, d, epsilon, rng=None, chunk_size=CHUNK_SIZE):
+    """
+    Support counts of the kRR reports of all `values`, perturbed and counted chunk by chunk.
+
+    A SeedSequence `rng` gives every chunk its own stream (ldp.seeding.chunk_rngs).
+    """
+    values = np.asarray(values).ravel()
+    starts = range(0, len(values), chunk_size)
+    counts = np.zeros(d, dtype=np.int64)
+    for start, chunk_rng in zip(starts, chunk_rngs(rng, len(starts))):
+        counts += aggregate_krr(perturb_krr(values[start:start + chunk_size], d, epsilon, chunk_rng), d)
+    return counts
+
+
+def estimate_krr(counts, n, epsilon, d):
+    """Unbiased frequency estimates (count/n - q)/(p - q) from kRR support counts"""
+    p, q = krr_params(epsilon, d)
+    return estimate_frequencies(counts, n, p, q)
+
+
+def simulate_krr_counts(hist, epsilon, trials=None, rng=None):
+    """
+    Exact sample of the kRR support counts given the true histogram `hist` (length d).
+
+    Returns shape (d,), or (trials, d) for `trials` independent draws.
+    """
+    rng = np.random.default_rng(rng)
+    hist = np.asarray(hist, dtype=np.int64)
+    d = len(hist)
+    p, q = krr_params(epsilon, d)
+    shape = (d,) if trials is None else (trials, d)
+    truthful = rng.binomial(hist, p - q, size=shape)
+    uniform = hist.sum() - truthful.sum(axis=-1)
+    return truthful + rng.multinomial(uniform, np.full(d, 1 / d))
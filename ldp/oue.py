@@ -0,0 +1,128 @@
+"""
+Bit-packed OUE (optimized unary encoding) simulation.
+
+Vectorized replacement for `encodePerturbOUE` in demo_tests/demo.html. Each
+report is a d-bit vector (the true item's bit is 1 with probability p = 1/2,
+every other bit with q = 1/(e^ε + 1), Eq. image10) stored as one `np.packbits`
+row of ceil(d/8) bytes: 10^6 reports over d = 1024 items take 128 MB instead
+of gigabytes. Users are processed in chunks of about CHUNK_BITS report bits;
+support counts are summed per chunk, and the packed reports can be kept (in
+memory or in a caller-supplied memmap) for detection work.
+
+When only the aggregate matters, `simulate_oue_counts` skips the reports:
+bits are independent, so the support count of item v is exactly
+Binom(n_v, p) + Binom(n - n_v, q), d binomial pairs per trial instead of n d
+coin flips.
+"""
+
+import numpy as np
+
+from ldp.estimation import estimate_frequencies
+from ldp.protocols import PROTOCOLS
+from ldp.seeding import chunk_rngs
+
+CHUNK_BITS = 1 << 24
+
+if hasattr(np, 'bitwise_count'):
+    bitwise_count = np.bitwise_count
+else:  # NumPy < 2.0
+    _POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+    def bitwise_count(x):
+        """Set bits of every byte of `x`, as np.bitwise_count"""
+        return _POPCOUNT8[x]
+
+
+def oue_params(epsilon):
+    """(p, q) = (1/2, 1/(e^ε+1)) (Eq. image10)"""
+    return PROTOCOLS['OUE'].support_probs(epsilon, None)
+
+
+def packed_width(d):
+    """Bytes per packed report"""
+    return (d + 7) // 8
+
+
+def chunk_users(d, chunk_size):
+    """`chunk_size`, or the number of d-item reports in CHUNK_BITS bits"""
+    return chunk_size or max(1, CHUNK_BITS // d)
+
+
+def _perturb_bits(values, d, epsilon, rng):
+    """(n, d) boolean OUE reports"""
+    p, q = oue_params(epsilon)
+    bits = rng.random((len(values), d), dtype=np.float32) < np.float32(q)
+    bits[np.arange(len(values)), values] = rng.random(len(values)) < p
+    return bits
+
+
+def perturb_oue(values, d, epsilon, rng=None):
+    """Packed OUE reports, shape (n, ceil(d/8)) uint8, for an array of true items in [0, d)"""
+    rng = np.random.default_rng(rng)
+    return np.packbits(_perturb_bits(np.asarray(values).ravel(), d, epsilon, rng), axis=1)
+
+
+def unpack_reports(packed, d):
+    """Boolean (n, d) view of packed reports"""
+    return np.unpackbits(packed, axis=-1, count=d).view(bool)
+
+
+def popcount(packed):
+    """Number of items each packed report supports"""
+    return bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+
+
+def support_counts(packed, d, chunk_size=None):
+    """Per-item support counts of packed reports, summed over chunks of rows"""
+    chunk_size = chunk_users(d, chunk_size)
+    counts = np.zeros(d, dtype=np.int64)
+    for start in range(0, len(packed), chunk_size):
+        counts += unpack_reports(packed[start:start + chunk_size], d).sum(axis=0)
+    return counts
+
+
+def simulate_oue(values, d, epsilon, rng=None, keep_reports=False, out=None, chunk_size=None):
+    """
+    OUE support counts of all `values`, perturbed chunk by chunk.
+
+    With `keep_reports` (or an `out` array of shape (n, ceil(d/8)) uint8, e.g.
+    an np.lib.format.open_memmap) the packed reports are kept and
+    (counts, reports) is returned; otherwise only the counts. A SeedSequence
+    `rng` gives every chunk its own stream (ldp.seeding.chunk_rngs).
+    """
+    values = np.asarray(values).ravel()
+    chunk_size = chunk_users(d, chunk_size)
+    if keep_reports and out is None:
+        out = np.empty((len(values), packed_width(d)), dtype=np.uint8)
+
+    starts = range(0, len(values), chunk_size)
+    counts = np.zeros(d, dtype=np.int64)
+    for start, chunk_rng in zip(starts, chunk_rngs(rng, len(starts))):
+        bits = _perturb_bits(values[start:start + chunk_size], d, epsilon, chunk_rng)
+        counts += bits.sum(axis=0)
+        if out is not None:
+            out[start:start + len(bits)] = np.packbits(bits, axis=1)
+    return counts if out is None else (counts, out)
+
+
+def simulate_oue_counts(hist, epsilon, trials=None, rng=None, fake_counts=None):
+    """
+    Exact sample of the OUE support counts given the true histogram `hist` (length d).
+
+    `fake_counts` is the fake users' crafted contribution, added as is: a
+    (d,) vector, e.g. m on every target item for MGA, or (trials, d) for
+    sampled contributions. Returns shape (d,), or (trials, d) for `trials`
+    independent draws.
+    """
+    rng = np.random.default_rng(rng)
+    hist = np.asarray(hist, dtype=np.int64)
+    p, q = oue_params(epsilon)
+    shape = hist.shape if trials is None else (trials,) + hist.shape
+    counts = rng.binomial(hist, p, size=shape) + rng.binomial(hist.sum() - hist, q, size=shape)
+    return counts if fake_counts is None else counts + fake_counts
+
+
+def estimate_oue(counts, n, epsilon):
+    """Unbiased frequency estimates (count/n - q)/(p - q) from OUE support counts"""
+    p, q = oue_params(epsilon)
+    return estimate_frequencies(counts, n, p, q)
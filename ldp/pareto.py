@@ -0,0 +1,112 @@
+"""
+Worst-case attack search and Pareto frontier across protocols and privacy budgets.
+
+An operator picks a protocol and epsilon and cares about three things, all to
+be minimized: the privacy loss epsilon, the estimator variance (Eq. image13)
+and the largest overall gain any of the three attacks can reach. The surfaces
+are evaluated vectorized over the epsilon grid; points over the variance
+budget and points beaten by another protocol at the same epsilon are pruned
+first, and a single sort-and-sweep pass extracts the frontier from the
+survivors instead of comparing every pair of grid points.
+"""
+
+import bisect
+
+import numpy as np
+
+from ldp.gains import broadcast_params
+from ldp.protocols import ATTACKS, PROTOCOLS, get_protocol
+
+EPSILONS = np.linspace(0.1, 5.0, 500)
+
+
+def worst_case_gain(protocol, beta=None, r=None, fT=None, epsilon=None, d=None):
+    """(max overall gain over the attacks, index into ATTACKS of the attack reaching it)"""
+    params = broadcast_params(beta=beta, r=r, fT=fT, epsilon=epsilon, d=d)
+    gains = np.stack(get_protocol(protocol).gains(**params))
+    worst = np.argmax(gains, axis=0)
+    return np.take_along_axis(gains, worst[None], axis=0)[0], worst
+
+
+def objective_surfaces(d, beta, epsilons=EPSILONS, n=1_000_000, r=None, fT=None, fv=0, protocols=None):
+    """
+    Variance and worst-case gain of every protocol over `epsilons`.
+
+    Returns {protocol: {'variance', 'max_gain', 'worst_attack'}} with arrays
+    shaped like `epsilons`.
+    """
+    protocols = tuple(PROTOCOLS) if protocols is None else tuple(protocols)
+    epsilons = np.asarray(epsilons, dtype=np.float64)
+    surfaces = {}
+    for name in protocols:
+        protocol = get_protocol(name)
+        max_gain, worst = worst_case_gain(protocol, beta=beta, r=r, fT=fT, epsilon=epsilons, d=d)
+        surfaces[protocol.name] = {
+            'variance': np.broadcast_to(protocol.variance(epsilons, d, n, fv), epsilons.shape),
+            'max_gain': max_gain,
+            'worst_attack': worst,
+        }
+    return surfaces
+
+
+def _nondominated(eps, var, gain):
+    """Mask of points no other point weakly beats in all of (eps, var, gain) and strictly in one"""
+    order = np.lexsort((gain, var, eps))
+    keep = np.zeros(len(eps), dtype=bool)
+    # staircase of frontier (var, gain) seen so far: var ascending, gain strictly descending
+    stair_eps, stair_var, stair_gain = [], [], []
+    for i in order:
+        e, v, g = eps[i], var[i], gain[i]
+        j = bisect.bisect_right(stair_var, v)
+        if j and stair_gain[j - 1] <= g:
+            if (stair_eps[j - 1], stair_var[j - 1], stair_gain[j - 1]) == (e, v, g):
+                keep[i] = True  # exact duplicate of a frontier point
+            continue  # otherwise an earlier point is at least as good everywhere and better somewhere
+        keep[i] = True
+        k = j
+        while k < len(stair_var) and stair_gain[k] >= g:
+            k += 1
+        stair_eps[j:k] = [e]
+        stair_var[j:k] = [v]
+        stair_gain[j:k] = [g]
+    return keep
+
+
+def pareto_frontier(d, beta, epsilons=EPSILONS, n=1_000_000, r=None, fT=None, fv=0, max_variance=None,
+                    protocols=None):
+    """
+    Pareto frontier of (epsilon, variance, worst-case gain) over protocols and `epsilons`.
+
+    `max_variance` drops candidates whose estimator variance is unacceptable
+    before the search. Returns a dict of equal-length arrays sorted by
+    epsilon: 'protocol', 'epsilon', 'variance', 'max_gain' and 'worst_attack'
+    (attack names).
+    """
+    surfaces = objective_surfaces(d, beta, epsilons, n, r, fT, fv, protocols)
+    names = list(surfaces)
+    epsilons = np.asarray(epsilons, dtype=np.float64)
+    var = np.stack([surfaces[name]['variance'] for name in names])
+    gain = np.stack([surfaces[name]['max_gain'] for name in names])
+    worst = np.stack([surfaces[name]['worst_attack'] for name in names])
+
+    # prune: over budget, or beaten by another protocol at the same epsilon
+    alive = np.ones(var.shape, dtype=bool) if max_variance is None else var <= max_variance
+    for a in range(len(names)):
+        for b in range(len(names)):
+            if a != b:
+                beaten = (var[b] <= var[a]) & (gain[b] <= gain[a]) & ((var[b] < var[a]) | (gain[b] < gain[a]))
+                alive[a] &= ~beaten
+
+    proto_idx, eps_idx = np.nonzero(alive)
+    keep = _nondominated(epsilons[eps_idx], var[proto_idx, eps_idx], gain[proto_idx, eps_idx])
+    proto_idx, eps_idx = proto_idx[keep], eps_idx[keep]
+    order = np.lexsort((proto_idx, epsilons[eps_idx]))
+    proto_idx, eps_idx = proto_idx[order], eps_idx[order]
+
+    return {
+        'protocol': np.array(names)[proto_idx],
+        'epsilon': epsilons[eps_idx],
+        'variance': var[proto_idx, eps_idx],
+        'max_gain': gain[proto_idx, eps_idx],
+        'worst_attack': np.array(ATTACKS)[worst[proto_idx, eps_idx]],
+    }
@@ -0,0 +1,103 @@
+"""
+PEM (prefix extending method) heavy-hitter identification, with optional poisoning.
+
+Items are γ = ceil(log2 d)-bit strings. Users are split evenly into g random
+groups; group j runs OLH on the first
+
+    λ_j = ceil(log2 k) + ceil(j (γ - ceil(log2 k)) / g)
+
+bits of its items, and the server estimates only the candidate prefixes
+R_{j-1} x {0,1}^(λ_j - λ_{j-1}), where R_{j-1} is the previous level's top-k
+(R_0 is every ceil(log2 k)-bit prefix). Each level therefore hashes a group
+of n/g reports against about k 2^(λ_j - λ_{j-1}) candidates, not the 2^λ_j
+possible prefixes, through the blocked `support_counts_olh` kernel, and the
+new top-k is taken with `argpartition`. The top-k of the last level are the
+heavy hitters. Table 2 defaults are k = 20, g = 10.
+
+Fake users are split across the groups like genuine ones and, at level j,
+run `attack` with the λ_j-bit prefixes of the targets as target items, as in
+the attacks paper. Its success rate is the fraction of targets among the
+final heavy hitters.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ldp.attacks import fake_reports
+from ldp.olh import estimate_olh, perturb_olh, support_counts_olh
+from ldp.seeding import chunk_rngs
+
+K = 20
+GROUPS = 10
+
+# One PEM iteration: prefix length, candidate prefixes, their estimated
+# frequencies and the top-k kept for the next level (sorted by estimate).
+PEMLevel = namedtuple('PEMLevel', ['bits', 'candidates', 'estimates', 'top'])
+PEMResult = namedtuple('PEMResult', ['heavy_hitters', 'estimates', 'levels'])
+
+
+def item_bits(d):
+    """γ: bits per item"""
+    return max(1, int(np.ceil(np.log2(d))))
+
+
+def prefix_lengths(d, k=K, g=GROUPS):
+    """(λ_0, [λ_1, ..., λ_g]): starting prefix length and the one of each group"""
+    gamma = item_bits(d)
+    start = min(int(np.ceil(np.log2(k))), gamma)
+    return start, [start + int(np.ceil(j * (gamma - start) / g)) for j in range(1, g + 1)]
+
+
+def extend(prefixes, bits):
+    """Every extension of `prefixes` by `bits` more bits: R x {0,1}^bits"""
+    return ((np.asarray(prefixes, dtype=np.uint32)[:, None] << np.uint32(bits))
+            | np.arange(1 << bits, dtype=np.uint32)).ravel()
+
+
+def top_k(candidates, estimates, k):
+    """The k candidates with the highest estimates, best first"""
+    if len(candidates) > k:
+        keep = np.argpartition(estimates, -k)[-k:]
+        candidates, estimates = candidates[keep], estimates[keep]
+    order = np.argsort(estimates)[::-1]
+    return candidates[order], estimates[order]
+
+
+def pem(values, d, epsilon, k=K, g=GROUPS, rng=None, attack=None, targets=None, m=0, max_workers=None):
+    """
+    Top-k heavy hitters of `values` (items in [0, d)) identified by PEM.
+
+    With `attack` ('RPA', 'RIA' or 'MGA') m fake users promote `targets`.
+    A SeedSequence `rng` gives each group its own stream. Returns a
+    PEMResult of the heavy hitters (best first), their estimated frequencies
+    and the PEMLevel of every group.
+    """
+    values = np.asarray(values).ravel()
+    gamma = item_bits(d)
+    start, lengths = prefix_lengths(d, k, g)
+    rngs = chunk_rngs(rng, g + 1)
+    groups = np.array_split(rngs[0].permutation(len(values)), g)
+    fakes = np.array_split(np.arange(int(m)), g)
+    targets = None if targets is None else np.asarray(targets, dtype=np.int64)
+
+    top = np.arange(1 << start, dtype=np.uint32)
+    previous, levels = start, []
+    for group, fake, bits, group_rng in zip(groups, fakes, lengths, rngs[1:]):
+        candidates = extend(top, bits - previous)
+        seeds, buckets = perturb_olh(values[group] >> (gamma - bits), epsilon, group_rng)
+        if attack is not None and len(fake):
+            fake_seeds, fake_buckets = fake_reports('OLH', attack, np.unique(targets >> (gamma - bits)),
+                                                   1 << bits, len(fake), epsilon, group_rng)
+            seeds, buckets = np.concatenate([seeds, fake_seeds]), np.concatenate([buckets, fake_buckets])
+        counts = support_counts_olh(seeds, buckets, 1 << bits, epsilon, items=candidates, max_workers=max_workers)
+        estimates = estimate_olh(counts, len(seeds), epsilon)
+        top, top_estimates = top_k(candidates, estimates, k)
+        levels.append(PEMLevel(bits, candidates, estimates, top))
+        previous = bits
+    return PEMResult(top, top_estimates, levels)
+
+
+def success_rate(heavy_hitters, targets):
+    """Fraction of the targets identified as heavy hitters"""
+    return np.isin(targets, heavy_hitters).mean()
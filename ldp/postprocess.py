@@ -0,0 +1,89 @@
+"""
+Post-processing of frequency estimates, including the normalization defense.
+
+The unbiased estimates (c/n - q)/(p - q) can be negative and need not sum to
+1; MGA's overall gain can even exceed 1. Each post-processor works on the
+last axis, so a single (d,) estimate and a (trials, d) batch are handled by
+the same few whole-array operations:
+
+  Norm        the attacks paper's countermeasure (Section 6.1): shift by the
+              smallest estimate and rescale, (f - f_min) / Σ (f - f_min)
+  Norm-Sub    zero the negative estimates and move the positive ones by one
+              common δ until they sum to 1, none going negative
+  Base-Cut    zero the estimates below the significance threshold of the
+              protocol's estimator noise, keep the rest unchanged
+  Projection  exact Euclidean projection onto the probability simplex,
+              max(f - θ, 0) with θ found from one sort and a cumsum:
+              O(d log d) instead of iterating
+
+When the positive estimates sum to at least 1, Norm-Sub's repeated
+subtraction converges to the projection, so it is computed from it; otherwise
+Norm-Sub only raises the positive estimates while the projection can also
+lift negative ones. Normalization leaves the ranking of items unchanged, so
+it has no effect on heavy hitter identification.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from ldp.protocols import get_protocol
+
+ALPHA = 0.05
+
+DEFENSES = ('Norm', 'Norm-Sub', 'Base-Cut', 'Projection')
+
+
+def normalize(estimates):
+    """(f - f_min) / Σ (f - f_min) along the last axis"""
+    shifted = np.asarray(estimates, dtype=np.float64)
+    shifted = shifted - shifted.min(axis=-1, keepdims=True)
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def project_simplex(estimates, total=1.0):
+    """Closest point (Euclidean) with non-negative entries summing to `total`, along the last axis"""
+    estimates = np.asarray(estimates, dtype=np.float64)
+    u = -np.sort(-estimates, axis=-1)
+    excess = np.cumsum(u, axis=-1) - total
+    # the entries kept positive are a prefix of the sorted ones: those above their running threshold
+    rho = np.count_nonzero(u * np.arange(1, u.shape[-1] + 1) > excess, axis=-1, keepdims=True)
+    theta = np.take_along_axis(excess, rho - 1, axis=-1) / rho
+    return np.maximum(estimates - theta, 0)
+
+
+def norm_sub(estimates):
+    """Norm-Sub: negative estimates to 0, positive ones shifted by a common δ to sum to 1"""
+    estimates = np.asarray(estimates, dtype=np.float64)
+    positive = estimates > 0
+    count = positive.sum(axis=-1, keepdims=True)
+    mass = np.where(positive, estimates, 0).sum(axis=-1, keepdims=True)
+    raised = np.where(positive, estimates + (1 - mass) / np.maximum(count, 1), 0)
+    return np.where((mass >= 1) | (count == 0), project_simplex(estimates), raised)
+
+
+def base_cut_threshold(protocol, epsilon, d, n, alpha=ALPHA):
+    """Estimate below which an item is indistinguishable from 0: z_(1-α/d) σ, Bonferroni over the d items"""
+    sigma = np.sqrt(get_protocol(protocol).variance(epsilon, d, np.asarray(n, dtype=np.float64)))
+    return NormalDist().inv_cdf(1 - alpha / d) * sigma
+
+
+def base_cut(estimates, threshold):
+    """Estimates below `threshold` (scalar, or one per leading index) set to 0"""
+    estimates = np.asarray(estimates, dtype=np.float64)
+    threshold = np.asarray(threshold, dtype=np.float64)[..., None]
+    return np.where(estimates >= threshold, estimates, 0)
+
+
+def postprocess(defense, estimates, protocol, epsilon, n, alpha=ALPHA):
+    """Estimates from n reports of `protocol` after the post-processing named `defense` (one of DEFENSES)"""
+    if defense == 'Norm':
+        return normalize(estimates)
+    if defense == 'Norm-Sub':
+        return norm_sub(estimates)
+    if defense == 'Base-Cut':
+        d = np.shape(estimates)[-1]
+        return base_cut(estimates, base_cut_threshold(protocol, epsilon, d, n, alpha))
+    if defense == 'Projection':
+        return project_simplex(estimates)
+    raise KeyError(f"unknown defense {defense!r}, expected one of {DEFENSES}")
@@ -0,0 +1,231 @@
+"""
+Registry of the LDP frequency-estimation protocols studied in
+"Data Poisoning Attacks to Local Differential Privacy Protocols".
+
+Each protocol is registered once with its support probabilities p and q
+(Eq. image10-image12) and the Table 1 overall gain of every attack, as a plain
+expression for scalar points and as in-place kernels for arrays. Terms the
+kernels share, such as e^ε - 1, are computed at most once per evaluation, only
+when an attack reads them, and handed to every attack, so figure scripts,
+notebooks and benchmarks all run the same (and the same optimized) math.
+"""
+
+import math
+from functools import partial
+
+import numpy as np
+
+ATTACKS = ('RPA', 'RIA', 'MGA')
+
+PROTOCOLS = {}
+
+
+def _float_copy(epsilon):
+    epsilon = np.asarray(epsilon)
+    return np.array(epsilon, dtype=epsilon.dtype if np.issubdtype(epsilon.dtype, np.floating) else np.float64)
+
+
+def _e_eps_m1(epsilon):
+    """e^ε - 1"""
+    e_eps_m1 = _float_copy(epsilon)
+    return np.expm1(e_eps_m1, out=e_eps_m1)
+
+
+def _mga_r_coef(epsilon):
+    """2 + 2/(e^ε - 1) = -2/(e^-ε - 1)"""
+    coef = _float_copy(epsilon)
+    np.negative(coef, out=coef)
+    np.expm1(coef, out=coef)
+    return np.divide(-2, coef, out=coef)
+
+
+def _scalars(*values):
+    """All values are plain numbers or 0-d (isinstance first: np.ndim alone costs more than the formula)"""
+    return all(isinstance(value, (int, float)) or np.ndim(value) == 0 for value in values)
+
+
+class Constants(dict):
+    """
+    Terms of ε shared by the gain formulas of one evaluation.
+
+    A term is computed the first time a formula asks for it and kept for the
+    other attacks, at the shape of ε alone, so an evaluation allocates only
+    the terms its attacks actually read (RPA and RIA read none).
+    """
+
+    builders = {'e_eps_m1': _e_eps_m1, 'mga_r_coef': _mga_r_coef}
+
+    def __init__(self, epsilon):
+        super().__init__()
+        self.epsilon = epsilon
+
+    def __missing__(self, key):
+        value = self[key] = self.builders[key](self.epsilon)
+        return value
+
+
+class Protocol:
+    """An LDP protocol: support probabilities p, q and the Table 1 gain of each attack"""
+
+    def __init__(self, name, p, q, gains, formulas):
+        self.name = name
+        self._p = p
+        self._q = q
+        # attack -> plain f(beta, r, fT, epsilon, d), the fast path for scalar points
+        self.formulas = formulas
+        # p, q: f(e^ε, d); attack -> f(beta, r, fT, d, c, out), with c = self.constants(epsilon, d);
+        # each formula is a chain of in-place ufuncs into `out`, which has the broadcast shape
+        self.gain_funcs = gains
+
+    def __repr__(self):
+        return f'Protocol({self.name!r})'
+
+    def constants(self, epsilon, d):
+        """Terms shared by the gain formulas, each built on first use (see Constants)"""
+        return Constants(epsilon)
+
+    def support_probs(self, epsilon, d):
+        """(p, q): probabilities that a report supports the true item / any other item"""
+        e_eps = np.exp(epsilon)
+        return self._p(e_eps, d), self._q(e_eps, d)
+
+    def variance(self, epsilon, d, n, fv=0):
+        """Estimator variance q(1-q)/(n(p-q)^2) + fv(1-fv)/n (Eq. image13)"""
+        p, q = self.support_probs(epsilon, d)
+        return q * (1 - q) / (n * (p - q)**2) + fv * (1 - fv) / n
+
+    def gain(self, attack, beta, r, fT, epsilon, d, constants=None, out=None):
+        """
+        Overall gain G of one attack.
+
+        Inputs are used at their own shapes and never broadcast; the result is
+        written into `out` (allocated with the broadcast shape when None), so
+        the evaluation needs no temporaries beyond that one array.
+        """
+        if out is None and constants is None and _scalars(beta, r, fT, epsilon, d):
+            return self.formulas[attack](beta, r, fT, epsilon, d)
+        c = self.constants(epsilon, d) if constants is None else constants
+        if out is not None:
+            return self.gain_funcs[attack](beta, r, fT, d, c, out)
+        dtype = np.result_type(beta, r, fT, epsilon, d)
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        out = np.empty(np.broadcast_shapes(*map(np.shape, (beta, r, fT, epsilon, d))), dtype=dtype)
+        out = self.gain_funcs[attack](beta, r, fT, d, c, out)
+        return out[()] if out.ndim == 0 else out
+
+    def gains(self, beta, r, fT, epsilon, d, out=None):
+        """(G_RPA, G_RIA, G_MGA) with the shared constants computed once; `out` is a dict of buffers by attack"""
+        if out is None and _scalars(beta, r, fT, epsilon, d):
+            return tuple(self.formulas[attack](beta, r, fT, epsilon, d) for attack in ATTACKS)
+        c = self.constants(epsilon, d)
+        out = {} if out is None else out
+        return tuple(self.gain(attack, beta, r, fT, epsilon, d, constants=c, out=out.get(attack))
+                     for attack in ATTACKS)
+
+    def attack_gain(self, attack):
+        """Gain of one attack as a plain f(beta, r, fT, epsilon, d)"""
+        return partial(self.gain, attack)
+
+
+def register(protocol):
+    """Add a protocol to PROTOCOLS under its name"""
+    PROTOCOLS[protocol.name] = protocol
+    return protocol
+
+
+def get_protocol(protocol):
+    """Look up a registered protocol by name (Protocol instances pass through)"""
+    return protocol if isinstance(protocol, Protocol) else PROTOCOLS[protocol]
+
+
+# Gain formulas from Table 1, as plain expressions for scalar points
+_FORMULAS_KRR = {
+    'RPA': lambda beta, r, fT, epsilon, d: beta * (r / d - fT),
+    'RIA': lambda beta, r, fT, epsilon, d: beta * (1 - fT),
+    'MGA': lambda beta, r, fT, epsilon, d: beta * (1 - fT) + beta * (d - r) / math.expm1(epsilon),
+}
+
+_FORMULAS_UE = {
+    'RIA': _FORMULAS_KRR['RIA'],
+    'MGA': lambda beta, r, fT, epsilon, d: beta * (2 * r - fT) + 2 * beta * r / math.expm1(epsilon),
+}
+
+
+# and as in-place kernels for arrays
+def _rpa_krr(beta, r, fT, d, c, out):
+    """β(r/d - fT)"""
+    np.divide(r, d, out=out)
+    out -= fT
+    out *= beta
+    return out
+
+
+def _rpa_oue(beta, r, fT, d, c, out):
+    """β(r - fT)"""
+    np.subtract(r, fT, out=out)
+    out *= beta
+    return out
+
+
+def _rpa_olh(beta, r, fT, d, c, out):
+    """-β*fT"""
+    np.multiply(beta, fT, out=out)
+    return np.negative(out, out=out)
+
+
+def _ria(beta, r, fT, d, c, out):
+    """β(1 - fT), the same for every protocol"""
+    np.subtract(1, fT, out=out)
+    out *= beta
+    return out
+
+
+def _mga_krr(beta, r, fT, d, c, out):
+    """β(1 - fT) + β(d - r)/(e^ε - 1)"""
+    np.subtract(d, r, out=out)
+    out /= c['e_eps_m1']
+    out -= fT
+    out += 1
+    out *= beta
+    return out
+
+
+def _mga_ue(beta, r, fT, d, c, out):
+    """β(2r - fT) + 2βr/(e^ε - 1), shared by OUE and OLH"""
+    np.multiply(r, c['mga_r_coef'], out=out)
+    out -= fT
+    out *= beta
+    return out
+
+
+register(Protocol(
+    'kRR',
+    p=lambda e_eps, d: e_eps / (e_eps + d - 1),
+    q=lambda e_eps, d: 1 / (e_eps + d - 1),
+    gains={'RPA': _rpa_krr, 'RIA': _ria, 'MGA': _mga_krr},
+    formulas=_FORMULAS_KRR,
+))
+
+register(Protocol(
+    'OUE',
+    p=lambda e_eps, d: np.full_like(e_eps, 0.5),
+    q=lambda e_eps, d: 1 / (e_eps + 1),
+    gains={'RPA': _rpa_oue, 'RIA': _ria, 'MGA': _mga_ue},
+    formulas=dict(_FORMULAS_UE, RPA=lambda beta, r, fT, epsilon, d: beta * (r - fT)),
+))
+
+# OLH with the optimal d' = e^ε + 1 hash buckets, as in the paper's analysis
+# (p = e^ε/(e^ε+d'-1) = 1/2 and q = 1/d'); simulations round d' to an integer.
+register(Protocol(
+    'OLH',
+    p=lambda e_eps, d: np.full_like(e_eps, 0.5),
+    q=lambda e_eps, d: 1 / (e_eps + 1),
+    gains={'RPA': _rpa_olh, 'RIA': _ria, 'MGA': _mga_ue},
+    formulas=dict(_FORMULAS_UE, RPA=lambda beta, r, fT, epsilon, d: -beta * fT),
+))
+
+# Table 1 signature (beta, r, fT, epsilon, d) -> (G_RPA, G_RIA, G_MGA)
+compute_gains_kRR = PROTOCOLS['kRR'].gains
+compute_gains_OUE = PROTOCOLS['OUE'].gains
+compute_gains_OLH = PROTOCOLS['OLH'].gains
@@ -0,0 +1,72 @@
+"""
+Walker/Vose alias sampling of items from a fixed categorical distribution.
+
+Python replacement for `sampleCategorical` / `sampleCategory` in the demos,
+which scan the cumulative weights for every draw (O(d) each). The alias
+table is built once in O(d) with Vose's method: every item i gets a column
+of height 1 holding its own probability `prob[i]` and the remainder taken
+from one larger item `alias[i]`. A draw is then a uniform column plus one
+biased coin, both taken from a single uniform x d: the integer part is the
+column and the fractional part the coin. Draws are whole-array operations,
+`chunk_size` users at a time into an item array of the smallest unsigned
+dtype, so 10^7 users take a fraction of a second and 40 MB or less.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ldp.seeding import chunk_rngs
+
+CHUNK_SIZE = 1 << 22
+
+# Probability of keeping each column's own item, and the item that fills the rest.
+AliasTable = namedtuple('AliasTable', ['prob', 'alias'])
+
+
+def item_dtype(d):
+    """Smallest unsigned dtype holding items in [0, d)"""
+    return np.min_scalar_type(max(int(d) - 1, 0))
+
+
+def alias_table(weights):
+    """AliasTable of the distribution proportional to `weights` (non-negative, not all 0)"""
+    weights = np.asarray(weights, dtype=np.float64).ravel()
+    if len(weights) == 0 or weights.min() < 0 or not weights.sum() > 0:
+        raise ValueError("alias table needs non-negative weights with a positive sum")
+    d = len(weights)
+    scaled = weights * (d / weights.sum())
+    prob = np.ones(d)
+    alias = np.arange(d, dtype=item_dtype(d))
+    small = np.flatnonzero(scaled < 1).tolist()
+    large = np.flatnonzero(scaled >= 1).tolist()
+    residual = scaled.tolist()
+    while small and large:
+        s, l = small.pop(), large[-1]
+        prob[s], alias[s] = residual[s], l
+        residual[l] -= 1 - residual[s]
+        if residual[l] < 1:
+            small.append(large.pop())
+    # leftovers are 1 up to rounding: they keep their own item
+    return AliasTable(prob, alias)
+
+
+def alias_sample(table, size, rng=None, chunk_size=CHUNK_SIZE, out=None):
+    """
+    `size` items drawn from `table`, generated `chunk_size` at a time.
+
+    Items are written into `out` (e.g. an np.lib.format.open_memmap) or a new
+    array of `item_dtype(d)`. A SeedSequence `rng` gives every chunk its own
+    stream (ldp.seeding.chunk_rngs).
+    """
+    d = len(table.prob)
+    if out is None:
+        out = np.empty(int(size), dtype=item_dtype(d))
+    starts = range(0, len(out), chunk_size)
+    for start, chunk_rng in zip(starts, chunk_rngs(rng, len(starts))):
+        x = chunk_rng.random(min(chunk_size, len(out) - start))
+        x *= d
+        column = x.astype(np.intp)
+        x -= column
+        out[start:start + len(x)] = np.where(x < table.prob[column], column, table.alias[column])
+    return out
@@ -0,0 +1,49 @@
+"""
+Reproducible random streams for parallel simulations.
+
+Every stream is a node of one `numpy.random.SeedSequence` spawn tree, addressed
+by its key, e.g. (protocol, parameter, attack, point, trial): node (i, j) is
+exactly `SeedSequence(seed).spawn(i + 1)[i].spawn(j + 1)[j]`, but is built
+directly from the key, so it is the same whichever worker builds it and
+whatever else was spawned first. Chunked simulators spawn one child per chunk
+under that node. A result is therefore fixed by (seed, key, chunk size) alone,
+not by the number of workers or the order they run in, and can be cached and
+compared across runs and machines.
+"""
+
+import numpy as np
+
+from ldp.gains import PARAMS
+from ldp.protocols import ATTACKS, PROTOCOLS
+
+SEED = 0
+
+
+def seed_sequence(seed=SEED, *key):
+    """The spawn-tree node `key` under root `seed`"""
+    return np.random.SeedSequence(seed, spawn_key=tuple(int(k) for k in key))
+
+
+def task_seed(task, point=0, seed=SEED):
+    """Stream of one executor Task at one parameter point: key (protocol, param, attack, point, trial)"""
+    return seed_sequence(seed, list(PROTOCOLS).index(task.protocol), PARAMS.index(task.param),
+                         ATTACKS.index(task.attack), point, task.trial)
+
+
+def task_rng(task, point=0, seed=SEED):
+    """Generator for `task_seed`"""
+    return np.random.default_rng(task_seed(task, point, seed))
+
+
+def chunk_rngs(rng, n_chunks):
+    """
+    One generator per chunk.
+
+    A SeedSequence gets an independent spawned child per chunk (the node
+    itself is left untouched, so repeated calls agree); anything else is
+    turned into a single generator shared by all chunks in order.
+    """
+    if isinstance(rng, np.random.SeedSequence):
+        node = np.random.SeedSequence(rng.entropy, spawn_key=rng.spawn_key, pool_size=rng.pool_size)
+        return [np.random.default_rng(child) for child in node.spawn(n_chunks)]
+    return [np.random.default_rng(rng)] * n_chunks
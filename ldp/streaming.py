@@ -0,0 +1,176 @@
+"""
+Streaming, constant-memory aggregation of recorded LDP reports.
+
+Python counterpart of `estimateFrequenciesFromReports` for report logs too
+large to load: a `StreamAggregator` keeps only the d support counters and the
+number of reports seen, folds in one chunk of reports at a time, and can
+return the unbiased estimate (c/n - q)/(p - q) at any point.
+
+Report formats follow the simulators:
+
+  kRR  item indices, any integer dtype
+  OUE  packed rows, (n, ceil(d/8)) uint8 as written by simulate_oue
+  OLH  (seeds, buckets) pairs, or a structured array with fields 'seed' and
+       'bucket' (OLH_DTYPE) when stored in a single file
+
+Sources are an iterable of chunks or a .npy path. Files are read with
+`np.fromfile` after the header, `chunk_size` rows at a time, never mapped or
+loaded whole, so memory stays bounded by one chunk whatever the number of rows.
+
+Support counts are additive, so shards can be aggregated in separate
+processes or hosts and combined exactly with `merge`. An aggregator
+serializes to a 32-byte header (magic, format version, protocol, counter
+width in bytes, d, n, ε) followed by the counts in the smallest unsigned dtype that
+holds them: a few KB for d = 1024, cheap to checkpoint and ship.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from ldp.krr import aggregate_krr, estimate_krr
+from ldp.olh import estimate_olh, support_counts_olh
+from ldp.oue import chunk_users, estimate_oue, packed_width, support_counts
+
+CHUNK_SIZE = 1 << 20
+
+OLH_DTYPE = np.dtype([('seed', '<u4'), ('bucket', 'u1')])
+
+MAGIC = b'LDPA'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sH4sBxIQd')  # magic, version, protocol, counts itemsize, pad, d, n, epsilon
+
+
+def olh_records(seeds, buckets):
+    """OLH reports as one structured array, for storing in a single .npy file"""
+    records = np.empty(len(seeds), dtype=OLH_DTYPE if np.max(buckets, initial=0) < 256 else
+                       np.dtype([('seed', '<u4'), ('bucket', '<u4')]))
+    records['seed'], records['bucket'] = seeds, buckets
+    return records
+
+
+def iter_npy(path, chunk_size=CHUNK_SIZE):
+    """Chunks of at most `chunk_size` rows of a .npy file, read sequentially"""
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        if fortran_order and len(shape) > 1:
+            raise ValueError(f"{path}: Fortran-ordered arrays cannot be streamed by rows")
+        row_shape = shape[1:]
+        row_items = int(np.prod(row_shape, dtype=np.int64))
+        for start in range(0, shape[0], chunk_size):
+            rows = min(chunk_size, shape[0] - start)
+            yield np.fromfile(f, dtype=dtype, count=rows * row_items).reshape((rows,) + row_shape)
+
+
+class StreamAggregator:
+    """Running support counts and report total of one protocol"""
+
+    def __init__(self, protocol, d, epsilon, max_workers=None):
+        if protocol not in ('kRR', 'OUE', 'OLH'):
+            raise KeyError(f"no report format for protocol {protocol!r}")
+        self.protocol, self.d, self.epsilon = protocol, int(d), float(epsilon)
+        self.max_workers = max_workers  # OLH aggregation threads
+        self.counts = np.zeros(self.d, dtype=np.int64)
+        self.n = 0
+
+    def default_chunk_size(self):
+        return chunk_users(self.d, None) if self.protocol == 'OUE' else CHUNK_SIZE
+
+    def update(self, reports):
+        """Fold one chunk of reports into the counters"""
+        if self.protocol == 'kRR':
+            reports = np.asarray(reports).ravel()
+            self.counts += aggregate_krr(reports, self.d)
+            self.n += len(reports)
+        elif self.protocol == 'OUE':
+            reports = np.asarray(reports, dtype=np.uint8).reshape(-1, packed_width(self.d))
+            self.counts += support_counts(reports, self.d)
+            self.n += len(reports)
+        else:
+            seeds, buckets = (reports['seed'], reports['bucket']) if isinstance(reports, np.ndarray) else reports
+            self.counts += support_counts_olh(seeds, buckets, self.d, self.epsilon, max_workers=self.max_workers)
+            self.n += len(seeds)
+        return self
+
+    def consume(self, source, chunk_size=None, progress=None):
+        """
+        Fold in every chunk of `source`, a .npy path or an iterable of chunks.
+
+        `progress(n)` is called with the running report total after each chunk.
+        """
+        if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+            source = iter_npy(source, chunk_size or self.default_chunk_size())
+        for chunk in source:
+            self.update(chunk)
+            if progress is not None:
+                progress(self.n)
+        return self
+
+    def merge(self, *others):
+        """Add the counts of aggregators of the same protocol, d and ε (in place)"""
+        for other in others:
+            if (other.protocol, other.d, other.epsilon) != (self.protocol, self.d, self.epsilon):
+                raise ValueError(f"cannot merge {other.protocol} (d={other.d}, ε={other.epsilon}) into "
+                                 f"{self.protocol} (d={self.d}, ε={self.epsilon})")
+            self.counts += other.counts
+            self.n += other.n
+        return self
+
+    def to_bytes(self):
+        """Compact binary form: header plus counts in the smallest unsigned dtype"""
+        counts = self.counts.astype(np.min_scalar_type(max(int(self.counts.max(initial=0)), 0)).newbyteorder('<'))
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, self.protocol.encode(), counts.dtype.itemsize,
+                              self.d, self.n, self.epsilon)
+        return header + counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, max_workers=None):
+        """Aggregator from `to_bytes` output"""
+        magic, version, protocol, width, d, n, epsilon = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not an aggregator state")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported aggregator format version {version}")
+        if width not in (1, 2, 4, 8):
+            raise ValueError(f"invalid counts width {width}")
+        agg = cls(protocol.rstrip(b'\0').decode(), d, epsilon, max_workers)
+        agg.counts[:] = np.frombuffer(data, dtype=np.dtype(f'<u{width}'), count=d, offset=_HEADER.size)
+        agg.n = n
+        return agg
+
+    def save(self, path):
+        """Write the binary state atomically, so an interrupted checkpoint never leaves a torn file"""
+        tmp = f'{os.fspath(path)}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, max_workers=None):
+        """Aggregator saved with `save`"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read(), max_workers)
+
+    def estimate(self):
+        """Unbiased frequency estimates from the reports so far (all NaN before the first report)"""
+        if self.n == 0:
+            return np.full(self.d, np.nan)
+        if self.protocol == 'kRR':
+            return estimate_krr(self.counts, self.n, self.epsilon, self.d)
+        if self.protocol == 'OUE':
+            return estimate_oue(self.counts, self.n, self.epsilon)
+        return estimate_olh(self.counts, self.n, self.epsilon)
+
+
+def merge_files(paths):
+    """One aggregator merged from saved shard states"""
+    shards = [StreamAggregator.load(path) for path in paths]
+    return shards[0].merge(*shards[1:])
+
+
+def aggregate_stream(protocol, source, d, epsilon, chunk_size=None, progress=None, max_workers=None):
+    """StreamAggregator over all of `source` (path or iterable of chunks)"""
+    return StreamAggregator(protocol, d, epsilon, max_workers).consume(source, chunk_size, progress)
@@ -0,0 +1,158 @@
+"""
+Chunked Cartesian sweep over all five Table 2 parameters.
+
+The full grid protocol x attack x beta x r x fT x epsilon x d rarely fits in
+RAM, so `run_sweep` walks the flattened parameter grid in fixed-size chunks
+and writes each chunk straight into memory-mapped `.npy` files. A store is a
+directory holding
+
+    gains.npy       overall gains, shape (protocol, attack, beta, r, fT, epsilon, d)
+    norm_gains.npy  normalized gains, same shape
+    axes.npz        axis values plus protocol and attack names
+
+and `load_sweep` reopens it read-only so slices can be pulled back later
+without recomputing anything. `iter_sweep` and `aiter_sweep` walk the same
+grid but hand each chunk to the caller as soon as it is computed, so plots,
+CSV writers or a local HTTP endpoint can render progressively.
+"""
+
+import asyncio
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from ldp.gains import PARAMS, RANGES, compute_gains
+from ldp.protocols import ATTACKS, PROTOCOLS
+
+GAINS_FILE = 'gains.npy'
+NORM_GAINS_FILE = 'norm_gains.npy'
+AXES_FILE = 'axes.npz'
+
+# One streamed piece of a sweep: flat grid positions [start, stop), the
+# parameter values at those points and the gains of every attack there.
+SweepChunk = namedtuple('SweepChunk', ['protocol', 'start', 'stop', 'params', 'gains', 'norm_gains'])
+
+
+class SweepStore:
+    """Read access to a sweep directory written by `run_sweep`"""
+
+    def __init__(self, path, mode='r'):
+        self.path = Path(path)
+        with np.load(self.path / AXES_FILE) as meta:
+            self.protocols = tuple(str(name) for name in meta['protocols'])
+            self.attacks = tuple(str(name) for name in meta['attacks'])
+            self.axes = {name: meta[name] for name in PARAMS}
+        self.gains = np.load(self.path / GAINS_FILE, mmap_mode=mode)
+        self.norm_gains = np.load(self.path / NORM_GAINS_FILE, mmap_mode=mode)
+
+    @property
+    def shape(self):
+        return self.gains.shape
+
+    def index(self, name, value):
+        """Position of `value` on parameter axis `name` (exact match up to float tolerance)"""
+        hits = np.flatnonzero(np.isclose(self.axes[name], value))
+        if hits.size == 0:
+            raise KeyError(f'{name}={value} is not on the sweep grid')
+        return int(hits[0])
+
+    def sel(self, protocol=None, attack=None, normalized=False, **params):
+        """
+        Slice of the stored grid. `protocol`/`attack` pick one name (None keeps
+        the axis); each keyword in PARAMS fixes that parameter to a grid value.
+        Returns an in-memory array with the fixed axes dropped.
+        """
+        key = [slice(None) if protocol is None else self.protocols.index(protocol),
+               slice(None) if attack is None else self.attacks.index(attack)]
+        for name in PARAMS:
+            key.append(slice(None) if params.get(name) is None else self.index(name, params[name]))
+        data = self.norm_gains if normalized else self.gains
+        return np.array(data[tuple(key)])
+
+
+def sweep_axes(**axes):
+    """Sweep axes: RANGES overridden by any 1-D arrays given per parameter"""
+    unknown = set(axes) - set(PARAMS)
+    if unknown:
+        raise ValueError(f'unknown sweep parameters: {sorted(unknown)}')
+    return {name: np.atleast_1d(np.asarray(axes.get(name, RANGES[name]), dtype=np.float64))
+            for name in PARAMS}
+
+
+def _grid_chunks(axes, chunk_size):
+    """(start, stop, parameter values) for consecutive chunks of the flattened grid"""
+    grid_shape = tuple(len(axes[name]) for name in PARAMS)
+    n_points = int(np.prod(grid_shape))
+    for start in range(0, n_points, chunk_size):
+        stop = min(start + chunk_size, n_points)
+        idx = np.unravel_index(np.arange(start, stop), grid_shape)
+        yield start, stop, {name: axes[name][i] for name, i in zip(PARAMS, idx)}
+
+
+def run_sweep(path, protocols=None, chunk_size=1 << 20, dtype=np.float64, **axes):
+    """
+    Evaluate every protocol and attack on the full Cartesian grid and store it at `path`.
+
+    Parameter axes default to RANGES; pass e.g. `epsilon=np.linspace(0.1, 5, 500)`
+    to override one. `protocols` defaults to every registered protocol. At most
+    `chunk_size` grid points are held in memory at a time, whatever the total
+    size; `dtype` (np.float32 halves the store) is both the evaluation and the
+    storage precision. Returns the finished store opened read-only.
+    """
+    protocols = tuple(PROTOCOLS) if protocols is None else tuple(protocols)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    axes = sweep_axes(**axes)
+    grid_shape = tuple(len(axes[name]) for name in PARAMS)
+    n_points = int(np.prod(grid_shape))
+    shape = (len(protocols), len(ATTACKS)) + grid_shape
+
+    np.savez(path / AXES_FILE, protocols=np.array(protocols), attacks=np.array(ATTACKS), **axes)
+    gains = np.lib.format.open_memmap(path / GAINS_FILE, mode='w+', dtype=dtype, shape=shape)
+    norm_gains = np.lib.format.open_memmap(path / NORM_GAINS_FILE, mode='w+', dtype=dtype, shape=shape)
+    flat_gains = gains.reshape(len(protocols), len(ATTACKS), n_points)
+    flat_norm = norm_gains.reshape(len(protocols), len(ATTACKS), n_points)
+
+    for start, stop, point in _grid_chunks(axes, chunk_size):
+        for p, protocol in enumerate(protocols):
+            # evaluated straight into the memory-mapped slices
+            out = ({attack: flat_gains[p, a, start:stop] for a, attack in enumerate(ATTACKS)},
+                   {attack: flat_norm[p, a, start:stop] for a, attack in enumerate(ATTACKS)})
+            compute_gains(protocol, **point, dtype=dtype, out=out)
+
+    gains.flush()
+    norm_gains.flush()
+    del flat_gains, flat_norm, gains, norm_gains
+    return SweepStore(path)
+
+
+def iter_sweep(protocols=None, chunk_size=1 << 16, dtype=np.float64, **axes):
+    """
+    Stream the Cartesian sweep of `run_sweep` as SweepChunk results.
+
+    Chunks come in grid order, one per protocol for each block of
+    `chunk_size` points, and nothing is kept after it has been yielded.
+    `start`/`stop` index the flattened (beta, r, fT, epsilon, d) grid, so a
+    consumer can place a chunk with np.unravel_index if it needs to.
+    """
+    protocols = tuple(PROTOCOLS) if protocols is None else tuple(protocols)
+    for start, stop, point in _grid_chunks(sweep_axes(**axes), chunk_size):
+        for protocol in protocols:
+            gains, norm_gains = compute_gains(protocol, **point, dtype=dtype)
+            yield SweepChunk(protocol, start, stop, point, gains, norm_gains)
+
+
+async def aiter_sweep(protocols=None, chunk_size=1 << 16, dtype=np.float64, **axes):
+    """Async-iterator form of `iter_sweep`; each chunk is computed in a worker thread"""
+    chunks = iter_sweep(protocols, chunk_size, dtype, **axes)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def load_sweep(path):
+    """Reopen a finished sweep read-only (memory-mapped, nothing is recomputed)"""
+    return SweepStore(path)
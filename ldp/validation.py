@@ -0,0 +1,178 @@
+"""
+Empirical check of the Table 1 gain formulas against the simulated protocols.
+
+For every panel of Figures 1-3 (protocol x varied parameter x attack) the
+attack is actually run: n genuine users with fT n of them on the r targets,
+m = βn/(1-β) fake users from ldp.attacks, and the server's estimates with
+and without the fake reports. The measured overall gain of a trial is
+Σ_t (f̃_t,after - f̃_t,before) over the same genuine reports, which cancels most
+of the genuine noise. kRR and OUE are sampled in count space, OLH from real
+reports aggregated on the target items only. With a `defense` from
+ldp.postprocess the whole estimate vector is simulated and post-processed
+before and after the attack, giving the defended gain instead.
+
+Trials run as executor Tasks on a process pool, one task per (protocol,
+parameter, attack, trial) covering the whole x range, with an independent
+ldp.seeding stream per parameter point, so results do not depend on the
+number of workers. `validate_figures`
+summarizes them into a mean, a normal-approximation confidence interval and a
+flag wherever the interval stays further than the tolerance from the formula.
+"""
+
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+from ldp.attacks import fake_counts, fake_reports
+from ldp.executor import experiment_tasks, run_tasks
+from ldp.gains import DEFAULTS, RANGES, compute_gains
+from ldp.krr import estimate_krr, simulate_krr_counts
+from ldp.olh import estimate_olh, simulate_olh, support_counts_olh
+from ldp.oue import estimate_oue, simulate_oue_counts
+from ldp.postprocess import postprocess
+from ldp.seeding import SEED, task_seed
+
+N_USERS = 10**5
+TRIALS = 20
+
+Validation = namedtuple('Validation', ['x', 'analytic', 'mean', 'lower', 'upper', 'flagged'])
+
+
+def population(d, r, fT, n):
+    """(hist, targets): n genuine users, fT n of them split over targets 0..r-1, the rest spread evenly"""
+    d, r = int(d), int(r)
+    hist = np.zeros(d, dtype=np.int64)
+    on_targets = int(round(fT * n))
+    hist[:r] = on_targets // r
+    hist[:on_targets % r] += 1
+    rest = n - on_targets
+    hist[r:] = rest // (d - r)
+    hist[r:r + rest % (d - r)] += 1
+    return hist, np.arange(r)
+
+
+def fake_users(beta, n):
+    """m with m/(n + m) = β"""
+    return int(round(beta * n / (1 - beta)))
+
+
+def _target_counts(protocol, hist, targets, epsilon, rng):
+    """Genuine support counts of the target items"""
+    if protocol == 'kRR':
+        return simulate_krr_counts(hist, epsilon, rng=rng)[targets]
+    if protocol == 'OUE':
+        return simulate_oue_counts(hist, epsilon, rng=rng)[targets]
+    seeds, buckets = simulate_olh(np.repeat(np.arange(len(hist)), hist), epsilon, rng)
+    return support_counts_olh(seeds, buckets, len(hist), epsilon, items=targets, max_workers=1)
+
+
+def _fake_target_counts(protocol, attack, targets, d, m, epsilon, rng):
+    """Fake users' support counts of the target items"""
+    if protocol != 'OLH':
+        return fake_counts(protocol, attack, targets, d, m, epsilon, rng=rng)[targets]
+    reports = fake_reports(protocol, attack, targets, d, m, epsilon, rng)
+    return support_counts_olh(*reports, d, epsilon, items=targets, max_workers=1)
+
+
+def _estimate(protocol, counts, n, epsilon, d):
+    if protocol == 'kRR':
+        return estimate_krr(counts, n, epsilon, d)
+    return (estimate_oue if protocol == 'OUE' else estimate_olh)(counts, n, epsilon)
+
+
+def _all_counts(protocol, hist, epsilon, trials, rng):
+    """Genuine support counts of every item, shape (d,) or (trials, d)"""
+    if protocol == 'kRR':
+        return simulate_krr_counts(hist, epsilon, trials, rng)
+    if protocol == 'OUE':
+        return simulate_oue_counts(hist, epsilon, trials, rng)
+    values = np.repeat(np.arange(len(hist)), hist)
+    counts = [support_counts_olh(*simulate_olh(values, epsilon, rng), len(hist), epsilon, max_workers=1)
+              for _ in range(1 if trials is None else trials)]
+    return counts[0] if trials is None else np.stack(counts)
+
+
+def defended_gains(protocol, attack, defense, beta, r, fT, epsilon, d, n=N_USERS, trials=None, rng=None):
+    """
+    Overall gains of simulated attacks when the server post-processes its estimates with `defense`.
+
+    The d estimates of all `trials` are simulated and post-processed as one
+    (trials, d) batch. Returns one gain, or a (trials,) array.
+    """
+    rng = np.random.default_rng(rng)
+    d = int(d)
+    hist, targets = population(d, r, fT, n)
+    m = fake_users(beta, n)
+    genuine = _all_counts(protocol, hist, epsilon, trials, rng)
+    fake = fake_counts(protocol, attack, targets, d, m, epsilon, trials, rng)
+    before = postprocess(defense, _estimate(protocol, genuine, n, epsilon, d), protocol, epsilon, n)
+    after = postprocess(defense, _estimate(protocol, genuine + fake, n + m, epsilon, d), protocol, epsilon, n + m)
+    return (after - before)[..., targets].sum(axis=-1)
+
+
+def measured_gain(protocol, attack, beta, r, fT, epsilon, d, n=N_USERS, rng=None, defense=None):
+    """Overall gain of one simulated attack at a single parameter point, optionally against a `defense`"""
+    if defense is not None:
+        return float(defended_gains(protocol, attack, defense, beta, r, fT, epsilon, d, n, rng=rng))
+    rng = np.random.default_rng(rng)
+    d = int(d)
+    hist, targets = population(d, r, fT, n)
+    m = fake_users(beta, n)
+    genuine = _target_counts(protocol, hist, targets, epsilon, rng)
+    fake = _fake_target_counts(protocol, attack, targets, d, m, epsilon, rng)
+    before = _estimate(protocol, genuine, n, epsilon, d)
+    after = _estimate(protocol, genuine + fake, n + m, epsilon, d)
+    return float((after - before).sum())
+
+
+def validation_line(task, n=N_USERS, seed=SEED, defense=None):
+    """Measured gains of one trial of `task.attack` as `task.param` sweeps RANGES (one panel line)"""
+    params = DEFAULTS.copy()
+    gains = []
+    for point, value in enumerate(RANGES[task.param]):
+        params[task.param] = value
+        gains.append(measured_gain(task.protocol, task.attack, n=n, rng=task_seed(task, point, seed),
+                                   defense=defense, **params))
+    return np.array(gains)
+
+
+def summarize(x, analytic, trials, z=1.96, rtol=0.05, atol=1e-3):
+    """
+    Validation of one panel line from its (trials, len(x)) measured gains.
+
+    A point is flagged when the z-sigma interval of the mean misses the band
+    analytic ± (rtol |analytic| + atol).
+    """
+    mean = trials.mean(axis=0)
+    half = z * trials.std(axis=0, ddof=1) / np.sqrt(len(trials))
+    tolerance = rtol * np.abs(analytic) + atol
+    flagged = (mean - half > analytic + tolerance) | (mean + half < analytic - tolerance)
+    return Validation(x, analytic, mean, mean - half, mean + half, flagged)
+
+
+def validate_figures(protocols=None, trials=TRIALS, n=N_USERS, max_workers=None, seed=SEED, defense=None,
+                     **tolerance):
+    """
+    Simulated vs analytic overall gains for every panel of Figures 1-3.
+
+    Returns ({protocol: {param: {attack: Validation}}}, results) with the
+    per-task TaskResults kept for timing reports. With a `defense` the
+    simulated gains are the defended ones, compared with the undefended
+    formulas. Keyword arguments `z`, `rtol` and `atol` go to `summarize`.
+    """
+    tasks = experiment_tasks(protocols, trials=trials)
+    results = run_tasks(partial(validation_line, n=n, seed=seed, defense=defense), tasks, max_workers)
+    lines = {}
+    for result in results:
+        task = result.task
+        lines.setdefault((task.protocol, task.param, task.attack), []).append(result.value)
+
+    merged = {}
+    for (protocol, param, attack), values in lines.items():
+        params = DEFAULTS.copy()
+        params[param] = RANGES[param]
+        gains, _ = compute_gains(protocol, **params)
+        merged.setdefault(protocol, {}).setdefault(param, {})[attack] = summarize(
+            RANGES[param], gains[attack], np.array(values), **tolerance)
+    return merged, results
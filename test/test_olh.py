@@ -0,0 +1,59 @@
+"""
+The blocked OLH aggregation engine against the naive per-item reference
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for the ldp package
+from ldp.olh import aggregate_olh, perturb_olh, support_counts_olh
+
+D = 100
+EPSILON = 1.0
+
+
+def reports(n=3000, seed=0, seed_pool=None, epsilon=EPSILON):
+    rng = np.random.default_rng(seed)
+    return perturb_olh(rng.integers(0, D, size=n), epsilon, rng, seed_pool=seed_pool)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('epsilon', [0.5, 1.0, 3.0])
+def test_random_seeds_match_reference(seed, epsilon):
+    seeds, buckets = reports(seed=seed, epsilon=epsilon)
+    assert np.array_equal(support_counts_olh(seeds, buckets, D, epsilon), aggregate_olh(seeds, buckets, D, epsilon))
+
+
+def test_duplicated_reports_match_reference():
+    seeds, buckets = reports(seed_pool=64)  # few distinct (seed, bucket) pairs: the weighted path
+    assert len(np.unique(seeds)) <= 64
+    assert np.array_equal(support_counts_olh(seeds, buckets, D, EPSILON), aggregate_olh(seeds, buckets, D, EPSILON))
+
+
+def test_items_subset():
+    seeds, buckets = reports()
+    items = np.array([97, 3, 3, 50, 0])
+    expected = aggregate_olh(seeds, buckets, D, EPSILON)[items]
+    assert np.array_equal(support_counts_olh(seeds, buckets, D, EPSILON, items=items), expected)
+
+
+@pytest.mark.parametrize('block_items, batch_users, max_workers', [
+    (1, 1, 1), (7, 100, 2), (16, 4096, None), (D, 333, 4), (1000, 10**6, 3),
+])
+def test_tiling_does_not_change_counts(block_items, batch_users, max_workers):
+    seeds, buckets = reports()
+    counts = support_counts_olh(seeds, buckets, D, EPSILON, block_items=block_items, batch_users=batch_users,
+                                max_workers=max_workers)
+    assert np.array_equal(counts, aggregate_olh(seeds, buckets, D, EPSILON))
+
+
+def test_progress_reaches_total():
+    seeds, buckets = reports()
+    calls = []
+    support_counts_olh(seeds, buckets, D, EPSILON, block_items=7, progress=lambda done, total: calls.append((done, total)))
+    assert len(calls) == -(-D // 7)
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+    assert calls[-1] == (D, D)
@@ -0,0 +1,64 @@
+"""
+The simplex projection and Norm-Sub against their optimality conditions and the iterative reference
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for the ldp package
+from ldp.postprocess import norm_sub, project_simplex
+
+D = 100
+
+
+def estimates(seed=0, shift=0.0, trials=None):
+    rng = np.random.default_rng(seed)
+    return rng.normal(shift, 0.05, size=(D,) if trials is None else (trials, D))
+
+
+def norm_sub_reference(f):
+    """Norm-Sub as published: zero the negatives, spread the missing mass over the rest, repeat"""
+    f = np.array(f, dtype=np.float64)
+    while True:
+        f[f < 0] = 0
+        positive = f > 0
+        delta = (1 - f.sum()) / max(positive.sum(), 1)
+        f[positive] += delta
+        if not (f < 0).any():
+            return f
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('shift', [-0.05, 0.0, 0.05])
+def test_projection_kkt(seed, shift):
+    f = estimates(seed, shift)
+    x = project_simplex(f)
+    assert x.min() >= 0
+    assert np.isclose(x.sum(), 1)
+    # x = max(f - θ, 0): one common θ on the support, and f <= θ off it
+    theta = (f - x)[x > 0]
+    assert np.allclose(theta, theta[0])
+    assert (f[x == 0] <= theta[0] + 1e-12).all()
+
+
+def test_projection_batch_matches_rows():
+    f = estimates(trials=5)
+    assert np.allclose(project_simplex(f), [project_simplex(row) for row in f])
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('shift', [-0.05, -0.02, 0.0, 0.05])
+def test_norm_sub_matches_reference(seed, shift):
+    f = estimates(seed, shift)
+    assert np.allclose(norm_sub(f), norm_sub_reference(f))
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_norm_sub_is_projection_when_positive_mass_reaches_one(seed):
+    f = estimates(seed, shift=0.05, trials=4)
+    assert (np.where(f > 0, f, 0).sum(axis=-1) >= 1).all()
+    assert np.allclose(norm_sub(f), project_simplex(f))
+    assert np.allclose(norm_sub(f), [norm_sub_reference(row) for row in f])
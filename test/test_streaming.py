@@ -0,0 +1,65 @@
+"""
+StreamAggregator state round-trips through to_bytes/from_bytes and merges exactly
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for the ldp package
+from ldp.krr import perturb_krr
+from ldp.olh import perturb_olh
+from ldp.oue import perturb_oue
+from ldp.streaming import StreamAggregator
+
+D = 100
+EPSILON = 1.0
+
+
+def reports(protocol, n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, D, size=n)
+    if protocol == 'kRR':
+        return perturb_krr(values, D, EPSILON, rng)
+    if protocol == 'OUE':
+        return perturb_oue(values, D, EPSILON, rng)
+    return perturb_olh(values, EPSILON, rng)
+
+
+@pytest.mark.parametrize('protocol', ['kRR', 'OUE', 'OLH'])
+def test_shards_round_trip_and_merge(protocol):
+    shards = [StreamAggregator(protocol, D, EPSILON).update(reports(protocol, seed=seed)) for seed in range(3)]
+    restored = [StreamAggregator.from_bytes(shard.to_bytes()) for shard in shards]
+    for shard, copy in zip(shards, restored):
+        assert (copy.protocol, copy.d, copy.epsilon, copy.n) == (shard.protocol, shard.d, shard.epsilon, shard.n)
+        assert np.array_equal(copy.counts, shard.counts)
+    merged = restored[0].merge(*restored[1:])
+    assert merged.n == sum(shard.n for shard in shards)
+    assert np.array_equal(merged.counts, sum(shard.counts for shard in shards))
+    assert np.allclose(merged.estimate(), StreamAggregator.from_bytes(merged.to_bytes()).estimate())
+
+
+@pytest.mark.parametrize('largest', [0, 255, 256, 2**32 - 1, 2**32, 2**40])
+def test_counts_width(largest):
+    agg = StreamAggregator('kRR', D, EPSILON)
+    agg.counts[-1], agg.n = largest, largest
+    copy = StreamAggregator.from_bytes(agg.to_bytes())
+    assert np.array_equal(copy.counts, agg.counts) and copy.n == largest
+
+
+def test_merge_mismatch():
+    with pytest.raises(ValueError):
+        StreamAggregator('kRR', D, EPSILON).merge(StreamAggregator('kRR', D, 2 * EPSILON))
+    with pytest.raises(ValueError):
+        StreamAggregator('kRR', D, EPSILON).merge(StreamAggregator('OUE', D, EPSILON))
+
+
+def test_rejects_other_data():
+    state = bytearray(StreamAggregator('kRR', D, EPSILON).to_bytes())
+    with pytest.raises(ValueError):
+        StreamAggregator.from_bytes(b'NOPE' + bytes(state[4:]))
+    state[4] = 2  # format version
+    with pytest.raises(ValueError):
+        StreamAggregator.from_bytes(bytes(state))